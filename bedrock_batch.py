@@ -0,0 +1,151 @@
+"""
+Bedrock Batch Inference for Dataset Builders
+Runs many application-model prompts as one S3-backed model invocation job
+instead of one InvokeModel call per prompt.
+
+Enabled with USE_BEDROCK_BATCH=1. Requires:
+- BEDROCK_BATCH_S3_URI: S3 prefix for job input/output (e.g. s3://bucket/deepeval)
+- BEDROCK_BATCH_ROLE_ARN: IAM role Bedrock assumes to read/write that prefix
+
+Note: Bedrock enforces a minimum number of records per batch job and jobs
+are queued, so this mode pays off for large datasets rather than quick runs.
+Requests already in the response cache are served from it and new outputs are
+recorded there, so replay mode works as for on-demand calls. If fewer than
+MIN_RECORDS prompts miss the cache, they are sent on demand instead. Batch jobs
+have their own Bedrock quotas, so they bypass the RPM/TPM rate limiter.
+"""
+import os
+import time
+import uuid
+
+import boto3
+import orjson
+
+import response_cache
+from bedrock_client import BEDROCK_CONFIG, bedrock_executor, build_request_body, invoke_qwen
+from bedrock_qwen import MODEL_ID
+
+MIN_RECORDS = 100  # Bedrock's minimum number of records per model invocation job
+POLL_INTERVAL_SECONDS = 30
+JOB_TIMEOUT_SECONDS = 6 * 60 * 60
+_TERMINAL_FAILURES = {"Failed", "Stopped", "Expired"}
+
+
+def is_enabled() -> bool:
+    """Return True when dataset builders should use batch inference."""
+    return os.environ.get("USE_BEDROCK_BATCH") == "1"
+
+
+def _split_s3_uri(uri: str) -> tuple[str, str]:
+    """Split s3://bucket/prefix into (bucket, prefix)."""
+    bucket, _, prefix = uri.removeprefix("s3://").partition("/")
+    return bucket, prefix.strip("/")
+
+
+def run(
+    prompts: list[str],
+    model_id: str = MODEL_ID,
+    max_tokens: int = 512,
+    temperature: float | list[float] = 0.2,
+) -> list[str]:
+    """
+    Run prompts through a Bedrock model invocation job and wait for results.
+
+    Args:
+        prompts: The input prompts to send to the model
+        model_id: Bedrock model identifier
+        max_tokens: Maximum tokens in each response
+        temperature: Sampling temperature (0.0-1.0), or one per prompt
+
+    Returns:
+        Model response texts in the same order as prompts
+    """
+    if isinstance(temperature, list):
+        temperatures = temperature
+    else:
+        temperatures = [temperature] * len(prompts)
+    responses = [
+        response_cache.lookup(model_id, prompt, max_tokens, temp)
+        for prompt, temp in zip(prompts, temperatures)
+    ]
+    pending = [i for i, response in enumerate(responses) if response is None]
+    if len(pending) < MIN_RECORDS:
+        # Too few for a job; on-demand calls go through the cache and rate limiter
+        return list(bedrock_executor.map(
+            lambda prompt, temp: invoke_qwen(model_id, prompt, max_tokens, temp),
+            prompts,
+            temperatures,
+        ))
+
+    outputs = _run_job(
+        [prompts[i] for i in pending],
+        [temperatures[i] for i in pending],
+        model_id,
+        max_tokens,
+    )
+    for i, output in zip(pending, outputs):
+        responses[i] = output
+        response_cache.store(model_id, prompts[i], max_tokens, temperatures[i], output)
+    return responses
+
+
+def _run_job(
+    prompts: list[str], temperatures: list[float], model_id: str, max_tokens: int
+) -> list[str]:
+    """Submit one model invocation job for prompts and return outputs in order."""
+    bucket, prefix = _split_s3_uri(os.environ["BEDROCK_BATCH_S3_URI"])
+    role_arn = os.environ["BEDROCK_BATCH_ROLE_ARN"]
+    job_name = f"deepeval-{uuid.uuid4().hex[:12]}"
+    job_prefix = f"{prefix}/{job_name}" if prefix else job_name
+
+    records = b"\n".join(
+        orjson.dumps({
+            "recordId": f"{i:08d}",
+            "modelInput": build_request_body(prompt, max_tokens, temperature),
+        })
+        for i, (prompt, temperature) in enumerate(zip(prompts, temperatures))
+    )
+    s3 = boto3.client("s3", config=BEDROCK_CONFIG)
+    s3.put_object(Bucket=bucket, Key=f"{job_prefix}/input.jsonl", Body=records)
+
+    bedrock = boto3.client("bedrock", config=BEDROCK_CONFIG)
+    job_arn = bedrock.create_model_invocation_job(
+        jobName=job_name,
+        roleArn=role_arn,
+        modelId=model_id,
+        inputDataConfig={
+            "s3InputDataConfig": {
+                "s3Uri": f"s3://{bucket}/{job_prefix}/input.jsonl",
+                "s3InputFormat": "JSONL",
+            }
+        },
+        outputDataConfig={
+            "s3OutputDataConfig": {"s3Uri": f"s3://{bucket}/{job_prefix}/output/"}
+        },
+    )["jobArn"]
+
+    deadline = time.monotonic() + JOB_TIMEOUT_SECONDS
+    while True:
+        job = bedrock.get_model_invocation_job(jobIdentifier=job_arn)
+        status = job["status"]
+        if status == "Completed":
+            break
+        if status in _TERMINAL_FAILURES:
+            raise RuntimeError(f"Bedrock batch job {job_name} {status}: {job.get('message', '')}")
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Bedrock batch job {job_name} still {status} after timeout")
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+    # Output lands under <output prefix>/<job id>/<input file name>.out
+    job_id = job_arn.rsplit("/", 1)[-1]
+    output = s3.get_object(Bucket=bucket, Key=f"{job_prefix}/output/{job_id}/input.jsonl.out")
+    outputs: dict[str, str] = {}
+    for line in output["Body"].iter_lines():
+        if not line:
+            continue
+        record = orjson.loads(line)
+        if "error" in record:
+            raise RuntimeError(f"Batch record {record['recordId']} failed: {record['error']}")
+        outputs[record["recordId"]] = record["modelOutput"]["choices"][0]["message"]["content"]
+
+    return [outputs[f"{i:08d}"] for i in range(len(prompts))]
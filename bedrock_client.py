@@ -0,0 +1,169 @@
+"""
+Shared Bedrock Runtime Client
+Single pooled boto3 client used by both the application model and the judge model.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import orjson
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+from rate_limiter import AdaptiveConcurrencyLimiter, estimate_tokens, get_limiter
+from response_cache import cache_mode, cached
+
+BEDROCK_REGION = "ap-south-1"
+MAX_CONCURRENCY = 16  # Upper bound on in-flight Bedrock calls from this process
+INITIAL_CONCURRENCY = 8  # Starting AIMD cap; grows toward MAX_CONCURRENCY while calls succeed
+_THROTTLE_CODES = {"ThrottlingException", "TooManyRequestsException"}
+
+BEDROCK_CONFIG = Config(
+    region_name=BEDROCK_REGION,
+    max_pool_connections=64,  # Enough headroom for concurrent judge + app calls
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    connect_timeout=3,
+    read_timeout=60,
+)
+
+
+def _set_keep_alive(request, **kwargs):
+    """Ask Bedrock to keep the TLS connection open for reuse by the pool."""
+    request.headers["Connection"] = "keep-alive"
+
+
+# Shared by every Bedrock call in this process; halves on throttling
+concurrency = AdaptiveConcurrencyLimiter(INITIAL_CONCURRENCY, MAX_CONCURRENCY)
+
+
+def _track_throttling(response=None, **kwargs):
+    """Shrink the concurrency cap on every throttled attempt, including retried ones."""
+    if response is None:
+        return None
+    error_code = response[1].get("Error", {}).get("Code")
+    if error_code in _THROTTLE_CODES:
+        concurrency.on_throttle()
+    return None  # Leave the retry decision to botocore
+
+
+@functools.lru_cache(maxsize=1)
+def get_bedrock_runtime():
+    """
+    Return the process-wide bedrock-runtime client, creating it on first use.
+    
+    Client creation parses the service model, so it is deferred until a test
+    actually calls Bedrock rather than paid at import/collection time.
+    """
+    client = boto3.client("bedrock-runtime", config=BEDROCK_CONFIG)
+    client.meta.events.register("before-sign.bedrock-runtime.*", _set_keep_alive)
+    client.meta.events.register("needs-retry.bedrock-runtime.*", _track_throttling)
+    return client
+
+
+# boto3 releases the GIL while waiting on the socket, so threads give real overlap
+bedrock_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="bedrock")
+
+
+def build_request_body(prompt: str, max_tokens: int, temperature: float) -> dict:
+    """Build the chat-completions request body expected by Qwen on Bedrock."""
+    return {
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+
+
+_PROMPT_SENTINEL = "\x00prompt\x00"
+_BODY_TEMPLATES: dict[tuple[int, float], tuple[bytes, bytes]] = {}
+
+
+def encode_request_body(prompt: str, max_tokens: int, temperature: float) -> bytes:
+    """
+    Serialize the request body, reusing the pre-encoded JSON around the prompt.
+    
+    The bytes before and after the prompt only depend on (max_tokens, temperature),
+    so they are encoded once and only the prompt string is serialized per call.
+    """
+    template = _BODY_TEMPLATES.get((max_tokens, temperature))
+    if template is None:
+        skeleton = orjson.dumps(build_request_body(_PROMPT_SENTINEL, max_tokens, temperature))
+        prefix, _, suffix = skeleton.partition(orjson.dumps(_PROMPT_SENTINEL))
+        template = _BODY_TEMPLATES[(max_tokens, temperature)] = (prefix, suffix)
+    prefix, suffix = template
+    return prefix + orjson.dumps(prompt) + suffix
+
+
+@cached
+def invoke_qwen(model_id: str, prompt: str, max_tokens: int, temperature: float) -> str:
+    """
+    Send a single-turn chat request to a Qwen model on Bedrock.
+    
+    Args:
+        model_id: Bedrock model identifier
+        prompt: The user message
+        max_tokens: Maximum tokens in response
+        temperature: Sampling temperature (0.0-1.0)
+    
+    Returns:
+        Model response text
+    """
+    get_limiter().acquire(estimate_tokens(prompt, max_tokens))
+    with concurrency:
+        resp = get_bedrock_runtime().invoke_model(
+            modelId=model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=encode_request_body(prompt, max_tokens, temperature),
+        )
+        payload = orjson.loads(resp["body"].read())
+    concurrency.on_success()
+    return payload["choices"][0]["message"]["content"]
+
+
+async def a_invoke_qwen(model_id: str, prompt: str, max_tokens: int, temperature: float) -> str:
+    """
+    Async version of invoke_qwen.
+    
+    The blocking boto3 call runs on bedrock_executor, so awaiting callers never
+    block the event loop and concurrent calls share the pooled client.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        bedrock_executor, invoke_qwen, model_id, prompt, max_tokens, temperature
+    )
+
+
+def _ping(model_id: str) -> None:
+    get_limiter().acquire(estimate_tokens("ok", 1))
+    try:
+        with concurrency:
+            get_bedrock_runtime().invoke_model(
+                modelId=model_id,
+                contentType="application/json",
+                accept="application/json",
+                body=encode_request_body("ok", 1, 0.0),
+            )["body"].read()
+    except (BotoCoreError, ClientError):
+        pass  # Real calls will surface the error with full context
+
+
+def warm_up(*model_ids: str) -> None:
+    """
+    Open pooled TLS connections before the first timed request.
+    
+    Sends an uncached 1-token request per model so the handshake cost is not
+    billed to whichever test happens to run first. Models in replay cache
+    mode never call Bedrock, so they are skipped. Errors are ignored.
+    
+    Args:
+        model_ids: Bedrock model identifiers to warm up
+    """
+    live = [model_id for model_id in model_ids if cache_mode(model_id) != "replay"]
+    list(bedrock_executor.map(_ping, live))
@@ -2,13 +2,15 @@
 Bedrock Qwen Client - Main Model Under Test
 Uses Qwen3-32B as the application model being evaluated.
 """
-import json
-import boto3
+import functools
+import os
+import re
 
-BEDROCK_REGION = "ap-south-1"
-MODEL_ID = "qwen.qwen3-32b-v1:0"  # Main model under test
+from bedrock_client import a_invoke_qwen, bedrock_executor, invoke_qwen
 
-bedrock_runtime = boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+# Main model under test; set QWEN_INFERENCE_PROFILE_ARN to route through a
+# cross-region inference profile instead of the single-region model
+MODEL_ID = os.environ.get("QWEN_INFERENCE_PROFILE_ARN") or "qwen.qwen3-32b-v1:0"
 
 
 def call_qwen(prompt: str, max_tokens: int = 512, temperature: float = 0.2) -> str:
@@ -23,24 +25,100 @@ def call_qwen(prompt: str, max_tokens: int = 512, temperature: float = 0.2) -> s
     Returns:
         Model response text
     """
-    body = {
-        "messages": [
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        "max_tokens": max_tokens,
-        "temperature": temperature,
-    }
-    resp = bedrock_runtime.invoke_model(
-        modelId=MODEL_ID,
-        contentType="application/json",
-        accept="application/json",
-        body=json.dumps(body),
+    return invoke_qwen(MODEL_ID, prompt, max_tokens, temperature)
+
+
+def call_qwen_many(prompts: list[str], max_tokens: int = 512, temperature: float = 0.2) -> list[str]:
+    """
+    Call Qwen3-32B for several prompts concurrently on the shared Bedrock pool.
+    
+    Args:
+        prompts: The input prompts to send to the model
+        max_tokens: Maximum tokens in each response
+        temperature: Sampling temperature (0.0-1.0)
+    
+    Returns:
+        Model response texts in the same order as prompts
+    """
+    return list(
+        bedrock_executor.map(lambda p: call_qwen(p, max_tokens, temperature), prompts)
+    )
+
+
+BATCH_SEPARATOR = "\n---\n"
+
+
+def call_qwen_batch(prompts: list[str], max_tokens: int = 512, temperature: float = 0.2) -> list[str]:
+    """
+    Answer several short questions with a single Bedrock request.
+    
+    The questions are numbered into one prompt and the model is asked to
+    separate its answers with '---'. If the reply does not split into one
+    answer per question, falls back to one request per question.
+    
+    Args:
+        prompts: The questions to answer
+        max_tokens: Maximum tokens per answer
+        temperature: Sampling temperature (0.0-1.0)
+    
+    Returns:
+        Model response texts in the same order as prompts
+    """
+    if len(prompts) < 2:
+        return call_qwen_many(prompts, max_tokens, temperature)
+
+    numbered = "\n".join(f"{i}. {prompt}" for i, prompt in enumerate(prompts, 1))
+    batch_prompt = (
+        f"Answer each question separated by '{BATCH_SEPARATOR.strip()}' on its own line. "
+        f"Do not repeat the questions.\n\n{numbered}\n"
     )
-    payload = json.loads(resp["body"].read())
-    return payload["choices"][0]["message"]["content"]
+    response = call_qwen(batch_prompt, max_tokens=max_tokens * len(prompts), temperature=temperature)
+    # Strip only the expected "i." / "i)" label, so answers like "3.00 × 10^8 m/s" stay intact
+    answers = [
+        re.sub(rf"^\s*{i}[.)](\s+|$)", "", answer).strip()
+        for i, answer in enumerate(response.strip().split(BATCH_SEPARATOR), 1)
+    ]
+    if len(answers) != len(prompts) or not all(answers):
+        return call_qwen_many(prompts, max_tokens, temperature)
+    return answers
+
+
+def _context_template(n: int) -> str:
+    return "\n\n".join(f"Context {i+1}: {{}}" for i in range(n))
+
+
+# Numbered "Context N: {}" layouts, parsed once at import for common context sizes
+_CONTEXT_TEMPLATES = {n: _context_template(n) for n in range(33)}
+
+
+@functools.lru_cache(maxsize=256)
+def _format_context(context: tuple[str, ...]) -> str:
+    """Number and join context documents; cached since contexts repeat across calls."""
+    template = _CONTEXT_TEMPLATES.get(len(context))
+    if template is None:
+        template = _context_template(len(context))
+    return template.format(*context)
+
+
+def build_context_prompt(prompt: str, context: list[str]) -> str:
+    """
+    Build the RAG prompt sent by call_qwen_with_context.
+    
+    Args:
+        prompt: User question/query
+        context: List of retrieved context documents
+    
+    Returns:
+        Full prompt with numbered context blocks
+    """
+    context_text = _format_context(tuple(context))
+    return f"""Use the following context to answer the question.
+
+{context_text}
+
+Question: {prompt}
+
+Answer:"""
 
 
 def call_qwen_with_context(prompt: str, context: list[str], max_tokens: int = 512) -> str:
@@ -55,12 +133,68 @@ def call_qwen_with_context(prompt: str, context: list[str], max_tokens: int = 51
     Returns:
         Model response text
     """
-    context_text = "\n\n".join([f"Context {i+1}: {c}" for i, c in enumerate(context)])
-    full_prompt = f"""Use the following context to answer the question.
+    return call_qwen(build_context_prompt(prompt, context), max_tokens=max_tokens, temperature=0.1)
 
-{context_text}
 
-Question: {prompt}
+class LazyAnswers(dict):
+    """Answers keyed by question, generated on first lookup."""
+    
+    def __init__(self, questions: dict[str, list[str] | None], max_tokens: int):
+        super().__init__()
+        self._questions = questions
+        self._max_tokens = max_tokens
+    
+    def __missing__(self, question: str) -> str:
+        context = self._questions[question]
+        if context:
+            answer = call_qwen_with_context(question, context, self._max_tokens)
+        else:
+            answer = call_qwen(question, self._max_tokens)
+        self[question] = answer
+        return answer
 
-Answer:"""
-    return call_qwen(full_prompt, max_tokens=max_tokens, temperature=0.1)
+
+def prefetch_answers(
+    questions: dict[str, list[str] | None], max_tokens: int = 512
+) -> dict[str, str]:
+    """
+    Answer many questions concurrently, each with optional retrieval context.
+    
+    Lets a test module generate every application-model output in one burst
+    on the shared Bedrock pool instead of one blocking call per test.
+    Under pytest-xdist each worker only runs some of a module's tests, so
+    answers are generated on first lookup instead of all up front.
+    
+    Args:
+        questions: Mapping of question to its context documents (None for no context)
+        max_tokens: Maximum tokens in each response
+    
+    Returns:
+        Model response texts keyed by question
+    """
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        return LazyAnswers(questions, max_tokens)
+    futures = {
+        question: (
+            bedrock_executor.submit(call_qwen_with_context, question, context, max_tokens)
+            if context
+            else bedrock_executor.submit(call_qwen, question, max_tokens)
+        )
+        for question, context in questions.items()
+    }
+    return {question: future.result() for question, future in futures.items()}
+
+
+async def a_call_qwen(prompt: str, max_tokens: int = 512, temperature: float = 0.2) -> str:
+    """
+    Async version of call_qwen for fanning out many prompts concurrently.
+    
+    The blocking boto3 call runs on the shared Bedrock executor, so concurrent
+    calls overlap on the network while staying within MAX_CONCURRENCY.
+    """
+    return await a_invoke_qwen(MODEL_ID, prompt, max_tokens, temperature)
+
+
+async def a_call_qwen_with_context(prompt: str, context: list[str], max_tokens: int = 512) -> str:
+    """Async version of call_qwen_with_context."""
+    return await a_call_qwen(build_context_prompt(prompt, context), max_tokens=max_tokens, temperature=0.1)
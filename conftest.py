@@ -1,9 +1,24 @@
 """
 Pytest configuration for DeepEval tests.
 """
+import os
+
 import pytest
 
 
+def pytest_addoption(parser):
+    """Add --deepeval-replay for re-running metrics on recorded outputs."""
+    parser.addoption(
+        "--deepeval-replay",
+        action="store_true",
+        default=False,
+        help=(
+            "Serve application-model outputs from .deepeval_cache only and fail "
+            "on any unrecorded prompt; judge calls still run normally"
+        ),
+    )
+
+
 def pytest_configure(config):
     """Add custom markers for test categorization."""
     config.addinivalue_line("markers", "slow: marks tests as slow")
@@ -11,10 +26,29 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "safety: marks tests as safety-related")
     config.addinivalue_line("markers", "geval: marks tests as custom G-Eval")
 
+    # Set in the environment so pytest-xdist workers inherit it
+    if config.getoption("--deepeval-replay"):
+        from bedrock_qwen import MODEL_ID
+        os.environ["DEEPEVAL_REPLAY_MODELS"] = MODEL_ID
+
+    # Reuse metric results for unchanged test cases on incremental CI runs;
+    # metric_cache pulls in the metrics and judge, so only import it when enabled
+    if os.environ.get("CI_INCREMENTAL") == "1":
+        import metric_cache
+        metric_cache.install()
+
 
 @pytest.fixture(scope="session")
 def qwen_judge():
     """Provide a shared QwenJudge instance for the session."""
-    from qwen_judge import QwenJudge
-    return QwenJudge()
+    from bedrock_client import warm_up
+    from bedrock_qwen import MODEL_ID
+    from metrics_registry import judge as shared_judge
+    from qwen_judge import JUDGE_MODEL_ID
+
+    judge = shared_judge()
+    # Pay the Bedrock TLS handshake up front instead of inside the first test;
+    # warm_up skips models that are replayed from the cache
+    warm_up(MODEL_ID, JUDGE_MODEL_ID)
+    return judge
 
@@ -0,0 +1,87 @@
+"""
+G-Eval with Precomputed Prompts
+GEval subclass that does the per-criteria work once instead of on every measure().
+
+- Evaluation steps generated from a criteria are reused by every metric instance
+  with the same criteria (DeepEval copies metrics per test case, so the copies
+  would otherwise regenerate them).
+- The results prompt is rendered once per set of evaluation steps with a
+  placeholder for the test case; each call only splices in the test-case text.
+"""
+from deepeval.metrics import GEval
+from deepeval.metrics.g_eval.utils import (
+    construct_g_eval_params_string,
+    construct_test_case_string,
+    format_rubrics,
+    number_evaluation_steps,
+)
+
+_TEST_CASE_SENTINEL = "\x00test_case\x00"
+
+# Shared across instances so per-test-case copies hit the same entries
+_STEPS: dict[tuple, list[str]] = {}
+_RESULTS_PROMPTS: dict[tuple, tuple[str, str]] = {}
+
+
+class FastGEval(GEval):
+    """
+    Drop-in GEval that caches evaluation steps and the static results-prompt text.
+
+    Trace-based metrics and calls with additional context fall back to GEval.
+    """
+
+    def _steps_key(self, multimodal: bool) -> tuple:
+        return (self.criteria, tuple(self.evaluation_params or ()), multimodal)
+
+    async def _a_generate_evaluation_steps(self, multimodal: bool) -> list[str]:
+        if self.evaluation_steps:
+            return self.evaluation_steps
+        key = self._steps_key(multimodal)
+        if key not in _STEPS:
+            _STEPS[key] = await super()._a_generate_evaluation_steps(multimodal)
+        return _STEPS[key]
+
+    def _generate_evaluation_steps(self, multimodal: bool) -> list[str]:
+        if self.evaluation_steps:
+            return self.evaluation_steps
+        key = self._steps_key(multimodal)
+        if key not in _STEPS:
+            _STEPS[key] = super()._generate_evaluation_steps(multimodal)
+        return _STEPS[key]
+
+    def _results_prompt(self, test_case, multimodal: bool, _additional_context):
+        if self.requires_trace or _additional_context:
+            return super()._results_prompt(test_case, multimodal, _additional_context)
+
+        key = (
+            self.evaluation_template,
+            tuple(self.evaluation_steps),
+            tuple(self.evaluation_params),
+            format_rubrics(self.rubric) if self.rubric else None,
+            self.score_range,
+            self.strict_mode,
+            multimodal,
+        )
+        parts = _RESULTS_PROMPTS.get(key)
+        if parts is None:
+            parts = _RESULTS_PROMPTS[key] = self._render_results_prompt(multimodal)
+        prefix, suffix = parts
+        return prefix + construct_test_case_string(self.evaluation_params, test_case) + suffix
+
+    def _render_results_prompt(self, multimodal: bool) -> tuple[str, str]:
+        """Render the results prompt around a placeholder and split it there."""
+        kwargs = {
+            "evaluation_steps": number_evaluation_steps(self.evaluation_steps),
+            "test_case_content": _TEST_CASE_SENTINEL,
+            "parameters": construct_g_eval_params_string(self.evaluation_params),
+            "_additional_context": None,
+            "multimodal": multimodal,
+        }
+        if self.strict_mode:
+            method = "generate_strict_evaluation_results"
+        else:
+            method = "generate_evaluation_results"
+            kwargs["rubric"] = format_rubrics(self.rubric) if self.rubric else None
+            kwargs["score_range"] = self.score_range
+        prefix, _, suffix = self._get_prompt(method, **kwargs).partition(_TEST_CASE_SENTINEL)
+        return prefix, suffix
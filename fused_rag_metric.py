@@ -0,0 +1,118 @@
+"""
+Fused RAG Metric
+Scores contextual precision, recall and relevancy with a single judge call.
+
+The three contextual metrics each send the judge the same input and retrieval
+context. This metric asks for all three scores in one JSON response, so the
+context is sent (and prefilled) once instead of three times.
+"""
+from deepeval.errors import MissingTestCaseParamsError
+from deepeval.metrics import BaseMetric
+from deepeval.metrics.utils import trimAndLoadJson
+from deepeval.test_case import LLMTestCase
+
+from qwen_judge import QwenJudge
+
+FUSED_SCORES = ("precision", "recall", "relevancy")
+
+_FUSED_PROMPT = """You are evaluating a retrieval-augmented generation (RAG) response.
+Score each criterion from 0.0 (worst) to 1.0 (best):
+
+- precision: Are the retrieval context nodes that are relevant to the input ranked above the irrelevant ones?
+- recall: How much of the expected output can be attributed to the retrieval context?
+- relevancy: What fraction of the retrieval context is relevant to the input?
+
+Input:
+{input}
+
+Actual Output:
+{actual_output}
+
+Expected Output:
+{expected_output}
+
+Retrieval Context:
+{retrieval_context}
+
+Only return valid JSON with this shape and no extra text:
+{{"precision": 0.0, "recall": 0.0, "relevancy": 0.0, "reasons": {{"precision": "...", "recall": "...", "relevancy": "..."}}}}
+
+JSON:"""
+
+
+class FusedRAGMetric(BaseMetric):
+    """
+    Contextual precision, recall and relevancy from one judge call.
+    
+    score is the lowest of the three, so the metric passes only when every
+    criterion meets the threshold. Individual scores are in score_breakdown.
+    """
+
+    prompt_template = _FUSED_PROMPT
+
+    def __init__(self, model: QwenJudge, threshold: float = 0.7):
+        self.model = model
+        self.threshold = threshold
+        self.evaluation_model = model.get_model_name()
+        self.include_reason = True
+        self.async_mode = True
+
+    def _prompt(self, test_case: LLMTestCase) -> str:
+        missing = [
+            name
+            for name in ("input", "actual_output", "expected_output", "retrieval_context")
+            if not getattr(test_case, name)
+        ]
+        if missing:
+            self.error = f"'{self.__name__}' requires {', '.join(missing)} on the test case"
+            raise MissingTestCaseParamsError(self.error)
+        retrieval_context = "\n".join(
+            f"{i}. {node}" for i, node in enumerate(test_case.retrieval_context, 1)
+        )
+        return self.prompt_template.format(
+            input=test_case.input,
+            actual_output=test_case.actual_output,
+            expected_output=test_case.expected_output,
+            retrieval_context=retrieval_context,
+        )
+
+    def _score(self, response: str) -> float:
+        data = trimAndLoadJson(response, self)
+        scores = {}
+        for name in FUSED_SCORES:
+            value = data.get(name)
+            try:
+                score = float(value)  # Also accepts quoted numbers like "0.8"
+            except (TypeError, ValueError):
+                score = None
+            # bool is an int subclass, but true/false is not a score
+            if isinstance(value, bool) or score is None or not 0 <= score <= 1:
+                self.error = (
+                    f"Evaluation LLM returned an invalid {name} score {value!r}; "
+                    "expected a number between 0 and 1."
+                )
+                raise ValueError(self.error)
+            scores[name] = score
+        reasons = data.get("reasons")
+        if not isinstance(reasons, dict):
+            reasons = {}
+        self.score_breakdown = scores
+        self.reason = "; ".join(
+            f"{name} {self.score_breakdown[name]:.2f}: {reasons.get(name, '')}"
+            for name in FUSED_SCORES
+        )
+        self.score = min(self.score_breakdown.values())
+        self.success = self.is_successful()
+        return self.score
+
+    def measure(self, test_case: LLMTestCase, *args, **kwargs) -> float:
+        self.error = None
+        return self._score(self.model.generate(self._prompt(test_case)))
+
+    async def a_measure(self, test_case: LLMTestCase, *args, **kwargs) -> float:
+        self.error = None
+        return self._score(await self.model.a_generate(self._prompt(test_case)))
+
+    @property
+    def __name__(self):
+        return "Fused RAG (Precision/Recall/Relevancy)"
@@ -0,0 +1,138 @@
+"""
+Metric Result Cache
+Memoizes metric score/reason/success by (metric config, test case) under
+.deepeval_cache/metrics/, so incremental CI runs only re-judge test cases whose
+inputs or outputs changed.
+
+Installed by conftest.py when CI_INCREMENTAL=1.
+"""
+import functools
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import orjson
+from deepeval import __version__ as DEEPEVAL_VERSION
+from deepeval.metrics import (
+    AnswerRelevancyMetric,
+    BiasMetric,
+    ContextualPrecisionMetric,
+    ContextualRecallMetric,
+    ContextualRelevancyMetric,
+    FaithfulnessMetric,
+    GEval,
+    HallucinationMetric,
+    ToxicityMetric,
+)
+
+from fused_rag_metric import FusedRAGMetric
+from qwen_judge import JUDGE_MODEL_ID
+
+CACHE_DIR = Path(".deepeval_cache") / "metrics"
+
+# Metric classes used by this suite
+CACHED_METRICS = (
+    AnswerRelevancyMetric,
+    BiasMetric,
+    ContextualPrecisionMetric,
+    ContextualRecallMetric,
+    ContextualRelevancyMetric,
+    FaithfulnessMetric,
+    FusedRAGMetric,
+    GEval,
+    HallucinationMetric,
+    ToxicityMetric,
+)
+
+
+def cache_key(metric, test_case) -> str:
+    """Return a stable hex key for a metric configuration and test case."""
+    # Judge model, DeepEval version (built-in metric templates) and custom
+    # prompt templates all change the result, so recorded scores must not
+    # outlive them
+    raw = orjson.dumps(
+        [
+            JUDGE_MODEL_ID,
+            DEEPEVAL_VERSION,
+            getattr(metric, "prompt_template", None),
+            type(metric).__name__,
+            metric.__name__,
+            metric.threshold,
+            metric.strict_mode,
+            getattr(metric, "criteria", None),
+            getattr(metric, "evaluation_steps", None),
+            getattr(metric, "evaluation_params", None),
+            test_case.input,
+            test_case.actual_output,
+            test_case.expected_output,
+            test_case.context,
+            test_case.retrieval_context,
+        ],
+        default=str,
+    )
+    return hashlib.blake2b(raw).hexdigest()
+
+
+def _restore(metric, key: str) -> bool:
+    try:
+        cached = orjson.loads((CACHE_DIR / f"{key}.json").read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return False
+    metric.score = cached["score"]
+    metric.reason = cached["reason"]
+    metric.success = cached["success"]
+    metric.score_breakdown = cached.get("score_breakdown")
+    metric.error = None
+    return True
+
+
+def _store(metric, key: str) -> None:
+    if metric.error is not None:
+        return
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = CACHE_DIR / f"{key}.json"
+    tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+    tmp.write_bytes(orjson.dumps({
+        "score": metric.score,
+        "reason": metric.reason,
+        "success": metric.success,
+        "score_breakdown": metric.score_breakdown,
+    }))
+    os.replace(tmp, path)
+
+
+def _wrap_measure(measure):
+    @functools.wraps(measure)
+    def wrapper(self, test_case, *args, **kwargs):
+        key = cache_key(self, test_case)
+        if _restore(self, key):
+            return self.score
+        result = measure(self, test_case, *args, **kwargs)
+        _store(self, key)
+        return result
+
+    return wrapper
+
+
+def _wrap_a_measure(a_measure):
+    @functools.wraps(a_measure)
+    async def wrapper(self, test_case, *args, **kwargs):
+        key = cache_key(self, test_case)
+        if _restore(self, key):
+            return self.score
+        result = await a_measure(self, test_case, *args, **kwargs)
+        _store(self, key)
+        return result
+
+    return wrapper
+
+
+def install() -> None:
+    """Patch measure/a_measure on CACHED_METRICS to consult the cache first."""
+    for metric_class in CACHED_METRICS:
+        if getattr(metric_class.measure, "_metric_cache", False):
+            continue
+        metric_class.measure = _wrap_measure(metric_class.measure)
+        metric_class.a_measure = _wrap_a_measure(metric_class.a_measure)
+        metric_class.measure._metric_cache = True
@@ -0,0 +1,112 @@
+"""
+Shared Metric Registry
+One QwenJudge and one instance per metric configuration for the whole test session.
+
+Test modules ask the registry for metrics instead of constructing their own, so
+identical configurations (e.g. AnswerRelevancyMetric at 0.7) are shared across files.
+"""
+from functools import lru_cache
+
+from deepeval.metrics import (
+    AnswerRelevancyMetric,
+    BiasMetric,
+    ContextualPrecisionMetric,
+    ContextualRecallMetric,
+    ContextualRelevancyMetric,
+    FaithfulnessMetric,
+    HallucinationMetric,
+    ToxicityMetric,
+)
+from deepeval.test_case import SingleTurnParams
+
+from fast_geval import FastGEval
+from fused_rag_metric import FusedRAGMetric
+from qwen_judge import QwenJudge
+
+
+@lru_cache(maxsize=1)
+def judge() -> QwenJudge:
+    """Return the session-wide Qwen judge."""
+    return QwenJudge()
+
+
+@lru_cache(maxsize=None)
+def answer_relevancy(threshold: float = 0.7) -> AnswerRelevancyMetric:
+    """Return the shared AnswerRelevancyMetric for a threshold."""
+    return AnswerRelevancyMetric(model=judge(), threshold=threshold)
+
+
+@lru_cache(maxsize=None)
+def faithfulness(threshold: float = 0.7) -> FaithfulnessMetric:
+    """Return the shared FaithfulnessMetric for a threshold."""
+    return FaithfulnessMetric(model=judge(), threshold=threshold)
+
+
+@lru_cache(maxsize=None)
+def hallucination(threshold: float = 0.5) -> HallucinationMetric:
+    """Return the shared HallucinationMetric for a threshold."""
+    return HallucinationMetric(model=judge(), threshold=threshold)
+
+
+@lru_cache(maxsize=None)
+def contextual_precision(threshold: float = 0.7) -> ContextualPrecisionMetric:
+    """Return the shared ContextualPrecisionMetric for a threshold."""
+    return ContextualPrecisionMetric(model=judge(), threshold=threshold)
+
+
+@lru_cache(maxsize=None)
+def contextual_recall(threshold: float = 0.7) -> ContextualRecallMetric:
+    """Return the shared ContextualRecallMetric for a threshold."""
+    return ContextualRecallMetric(model=judge(), threshold=threshold)
+
+
+@lru_cache(maxsize=None)
+def contextual_relevancy(threshold: float = 0.7) -> ContextualRelevancyMetric:
+    """Return the shared ContextualRelevancyMetric for a threshold."""
+    return ContextualRelevancyMetric(model=judge(), threshold=threshold)
+
+
+@lru_cache(maxsize=None)
+def fused_rag(threshold: float = 0.7) -> FusedRAGMetric:
+    """Return the shared FusedRAGMetric (precision, recall and relevancy in one call)."""
+    return FusedRAGMetric(model=judge(), threshold=threshold)
+
+
+@lru_cache(maxsize=None)
+def bias(threshold: float = 0.5) -> BiasMetric:
+    """Return the shared BiasMetric for a threshold."""
+    return BiasMetric(model=judge(), threshold=threshold)
+
+
+@lru_cache(maxsize=None)
+def toxicity(threshold: float = 0.5) -> ToxicityMetric:
+    """Return the shared ToxicityMetric for a threshold."""
+    return ToxicityMetric(model=judge(), threshold=threshold)
+
+
+@lru_cache(maxsize=None)
+def geval(
+    name: str,
+    criteria: str,
+    params: tuple[SingleTurnParams, ...],
+    threshold: float = 0.7,
+) -> FastGEval:
+    """
+    Return the shared G-Eval metric for a configuration.
+    
+    Args:
+        name: Metric name shown in results
+        criteria: Evaluation criteria for the judge
+        params: Test case fields the judge sees (a tuple, so it can be cached)
+        threshold: Minimum passing score
+    
+    Returns:
+        FastGEval metric backed by the session judge
+    """
+    return FastGEval(
+        name=name,
+        model=judge(),
+        evaluation_params=list(params),
+        criteria=criteria,
+        threshold=threshold,
+    )
@@ -3,14 +3,17 @@ Qwen Judge Model for DeepEval
 Uses Qwen3-235B as the judge/evaluator model for LLM evaluation metrics.
 This larger model evaluates outputs from the smaller Qwen3-32B application model.
 """
-import json
-import boto3
+import os
+
 from deepeval.models.base_model import DeepEvalBaseLLM
 
-BEDROCK_REGION = "ap-south-1"
-JUDGE_MODEL_ID = "qwen.qwen3-235b-a22b-2507-v1:0"  # Judge model (larger, more capable)
+from bedrock_client import a_invoke_qwen, invoke_qwen
 
-bedrock_runtime = boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+# Judge model (larger, more capable); set QWEN_JUDGE_INFERENCE_PROFILE_ARN to
+# route through a cross-region inference profile
+JUDGE_MODEL_ID = (
+    os.environ.get("QWEN_JUDGE_INFERENCE_PROFILE_ARN") or "qwen.qwen3-235b-a22b-2507-v1:0"
+)
 
 
 def _raw_qwen_call(prompt: str, max_tokens: int = 1024) -> str:
@@ -24,24 +27,13 @@ def _raw_qwen_call(prompt: str, max_tokens: int = 1024) -> str:
     Returns:
         Judge model response
     """
-    body = {
-        "messages": [
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        "max_tokens": max_tokens,
-        "temperature": 0.1,  # Low temperature for consistent evaluation
-    }
-    resp = bedrock_runtime.invoke_model(
-        modelId=JUDGE_MODEL_ID,
-        contentType="application/json",
-        accept="application/json",
-        body=json.dumps(body),
-    )
-    payload = json.loads(resp["body"].read())
-    return payload["choices"][0]["message"]["content"]
+    # Low temperature for consistent evaluation
+    return invoke_qwen(JUDGE_MODEL_ID, prompt, max_tokens, temperature=0.1)
+
+
+async def _a_raw_qwen_call(prompt: str, max_tokens: int = 1024) -> str:
+    """Async version of _raw_qwen_call."""
+    return await a_invoke_qwen(JUDGE_MODEL_ID, prompt, max_tokens, temperature=0.1)
 
 
 class QwenJudge(DeepEvalBaseLLM):
@@ -70,8 +62,14 @@ class QwenJudge(DeepEvalBaseLLM):
         return _raw_qwen_call(prompt)
 
     async def a_generate(self, prompt: str) -> str:
-        """Async wrapper for generate method."""
-        return self.generate(prompt)
+        """
+        Async version of generate.
+        
+        Does not block the event loop, so DeepEval's concurrent metric
+        evaluation (e.g. several metrics in one assert_test) actually
+        overlaps judge calls.
+        """
+        return await _a_raw_qwen_call(prompt)
 
     def get_model_name(self) -> str:
         """Return model identifier."""
@@ -0,0 +1,144 @@
+"""
+Bedrock Rate Limiter
+Token buckets that keep this process under Bedrock's requests- and tokens-per-minute quotas,
+plus an AIMD concurrency limit that backs off when Bedrock throttles.
+
+Set BEDROCK_RPM_LIMIT and/or BEDROCK_TPM_LIMIT to the account quotas for the
+model. Under pytest-xdist the budget is split evenly across workers, so each
+worker refills at RPM/E and TPM/E (E = PYTEST_XDIST_WORKER_COUNT). Limits that
+are not set are not enforced.
+"""
+import functools
+import os
+import threading
+import time
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough token cost of a request: ~4 characters per prompt token plus the output budget."""
+    return len(prompt) // 4 + max_tokens
+
+
+class TokenBucketLimiter:
+    """
+    Two token buckets (requests and tokens) refilled continuously per minute.
+    
+    acquire() blocks until both buckets can pay for the request, so callers
+    pace themselves at the quota instead of running into throttling errors.
+    """
+
+    def __init__(self, requests_per_minute: float | None, tokens_per_minute: float | None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = requests_per_minute or 0.0
+        self._tokens = tokens_per_minute or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated) / 60
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(
+                self.requests_per_minute,
+                self._requests + elapsed_minutes * self.requests_per_minute,
+            )
+        if self.tokens_per_minute:
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + elapsed_minutes * self.tokens_per_minute,
+            )
+
+    def _wait_seconds(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests_per_minute and self._requests < 1:
+            wait = max(wait, (1 - self._requests) / self.requests_per_minute * 60)
+        if self.tokens_per_minute and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) / self.tokens_per_minute * 60)
+        return wait
+
+    def acquire(self, estimated_tokens: int) -> None:
+        """
+        Block until one request of estimated_tokens fits in the per-minute budget.
+        
+        Args:
+            estimated_tokens: Expected input + output tokens for the request
+        """
+        if not self.requests_per_minute and not self.tokens_per_minute:
+            return
+        if self.tokens_per_minute:
+            # A request larger than a full minute's budget would never fit
+            estimated_tokens = min(estimated_tokens, self.tokens_per_minute)
+        # Waiters queue on the lock, so requests are admitted in arrival order
+        with self._lock:
+            self._refill()
+            wait = self._wait_seconds(estimated_tokens)
+            while wait > 0:
+                time.sleep(wait)
+                self._refill()
+                wait = self._wait_seconds(estimated_tokens)
+            if self.requests_per_minute:
+                self._requests -= 1
+            if self.tokens_per_minute:
+                self._tokens -= estimated_tokens
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase/multiplicative-decrease cap on in-flight Bedrock calls.
+    
+    The cap grows by one after a full window of successful calls (as many
+    successes as the current cap) and halves on every throttling response,
+    so concurrency settles just below what Bedrock sustains. Use as a
+    context manager around each call.
+    """
+    
+    def __init__(self, initial: int, maximum: int):
+        self.limit = min(initial, maximum)
+        self.maximum = maximum
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+    
+    def __enter__(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        return self
+    
+    def __exit__(self, *exc_info):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+    
+    def on_success(self) -> None:
+        """Record a successful call; widen the cap after a full window."""
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify()
+    
+    def on_throttle(self) -> None:
+        """Record a throttling response; halve the cap."""
+        with self._cond:
+            self.limit = max(1, self.limit // 2)
+            self._successes = 0
+
+
+def _limit_from_env(name: str, workers: int) -> float | None:
+    value = os.environ.get(name)
+    return float(value) / workers if value else None
+
+
+@functools.lru_cache(maxsize=1)
+def get_limiter() -> TokenBucketLimiter:
+    """Return this process's limiter, sized to its share of the configured quotas."""
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return TokenBucketLimiter(
+        _limit_from_env("BEDROCK_RPM_LIMIT", workers),
+        _limit_from_env("BEDROCK_TPM_LIMIT", workers),
+    )
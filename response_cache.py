@@ -0,0 +1,127 @@
+"""
+Response Cache for Bedrock Calls
+Exact-match (model, prompt, sampling params) SHA-256-keyed cache in front of the Bedrock invoke helper.
+Hits are served from memory first, then from JSON files under .deepeval_cache/.
+
+DEEPEVAL_CACHE_MODE selects how the cache is used:
+- enabled (default): serve hits, call Bedrock and store on misses
+- replay: serve hits only; a miss raises so CI fails when a new prompt appears
+- write-only: always call Bedrock and overwrite the stored response
+- disabled: bypass the cache entirely (DEEPEVAL_NO_CACHE=1 is an alias)
+
+DEEPEVAL_REPLAY_MODELS (comma-separated model IDs) forces replay for just those
+models, e.g. replaying application outputs while the judge still runs live.
+"""
+import functools
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import orjson
+
+CACHE_DIR = Path(".deepeval_cache")
+
+CACHE_MODES = ("enabled", "replay", "write-only", "disabled")
+
+_memory: dict[str, str] = {}
+
+
+def cache_mode(model_id: str | None = None) -> str:
+    """Return the active cache mode for a model from the DEEPEVAL_* environment."""
+    if model_id and model_id in os.environ.get("DEEPEVAL_REPLAY_MODELS", "").split(","):
+        return "replay"
+    if os.environ.get("DEEPEVAL_NO_CACHE") == "1":
+        return "disabled"
+    mode = os.environ.get("DEEPEVAL_CACHE_MODE", "enabled")
+    if mode not in CACHE_MODES:
+        raise ValueError(f"DEEPEVAL_CACHE_MODE must be one of {CACHE_MODES}, got {mode!r}")
+    return mode
+
+
+def cache_key(model_id: str, prompt: str, max_tokens: int, temperature: float) -> str:
+    """
+    Return a stable hex key for a single Bedrock request.
+
+    Context passed to call_qwen_with_context is already part of the prompt,
+    so it is covered by the key.
+    """
+    raw = f"{model_id}|{max_tokens}|{temperature}|{prompt}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _read(key: str) -> str | None:
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        return orjson.loads(path.read_bytes())["response"]
+    except (FileNotFoundError, orjson.JSONDecodeError, KeyError):
+        return None
+
+
+def _write(key: str, response: str) -> None:
+    CACHE_DIR.mkdir(exist_ok=True)
+    path = CACHE_DIR / f"{key}.json"
+    # Write-then-rename so concurrent workers never read a partial file
+    tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+    tmp.write_bytes(orjson.dumps({"response": response}))
+    os.replace(tmp, path)
+
+
+def lookup(model_id: str, prompt: str, max_tokens: int, temperature: float) -> str | None:
+    """
+    Return the cached response for a request under the active cache mode.
+
+    Returns:
+        The cached response, or None when the request should be sent to Bedrock
+
+    Raises:
+        RuntimeError: On a miss in replay mode
+    """
+    mode = cache_mode(model_id)
+    if mode in ("disabled", "write-only"):
+        return None
+    key = cache_key(model_id, prompt, max_tokens, temperature)
+    response = _memory.get(key)
+    if response is None:
+        response = _read(key)
+    if response is None:
+        if mode == "replay":
+            raise RuntimeError(
+                f"Cache miss for {model_id} prompt {prompt[:60]!r} (key {key}) "
+                "in replay mode; rerun without --deepeval-replay / "
+                "DEEPEVAL_CACHE_MODE=replay to record it"
+            )
+        return None
+    _memory[key] = response
+    return response
+
+
+def store(model_id: str, prompt: str, max_tokens: int, temperature: float, response: str) -> None:
+    """Record a Bedrock response unless caching is disabled."""
+    if cache_mode(model_id) == "disabled":
+        return
+    key = cache_key(model_id, prompt, max_tokens, temperature)
+    _write(key, response)
+    _memory[key] = response
+
+
+def cached(invoke):
+    """
+    Cache an invoke(model_id, prompt, max_tokens, temperature) -> str function.
+
+    Args:
+        invoke: The uncached Bedrock invoke function
+
+    Returns:
+        Wrapped function that consults the memory and disk caches according
+        to the active cache mode
+    """
+    @functools.wraps(invoke)
+    def wrapper(model_id: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        response = lookup(model_id, prompt, max_tokens, temperature)
+        if response is None:
+            response = invoke(model_id, prompt, max_tokens, temperature)
+            store(model_id, prompt, max_tokens, temperature, response)
+        return response
+
+    return wrapper
@@ -0,0 +1,79 @@
+"""
+Bedrock Client Unit Tests
+
+Offline tests for warm-up and concurrency handling; Bedrock is replaced by a
+stub client.
+"""
+import io
+
+import orjson
+import pytest
+
+import bedrock_client
+from rate_limiter import AdaptiveConcurrencyLimiter
+
+
+class StubRuntime:
+    """bedrock-runtime stand-in that records each call and its concurrency level."""
+
+    def __init__(self):
+        self.calls = []
+
+    def invoke_model(self, modelId, **kwargs):
+        self.calls.append((modelId, bedrock_client.concurrency._in_flight))
+        payload = {"choices": [{"message": {"content": f"reply from {modelId}"}}]}
+        return {"body": io.BytesIO(orjson.dumps(payload))}
+
+
+@pytest.fixture
+def runtime(monkeypatch):
+    """Route bedrock_client through a stub runtime with a concurrency cap of 1."""
+    stub = StubRuntime()
+    monkeypatch.setattr(bedrock_client, "get_bedrock_runtime", lambda: stub)
+    monkeypatch.setattr(bedrock_client, "concurrency", AdaptiveConcurrencyLimiter(1, 1))
+    return stub
+
+
+@pytest.fixture
+def cache_env(monkeypatch):
+    """Clear DEEPEVAL_* cache settings so each test sets its own."""
+    for name in ("DEEPEVAL_CACHE_MODE", "DEEPEVAL_NO_CACHE", "DEEPEVAL_REPLAY_MODELS"):
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+# ==============================================================================
+# INVOKE
+# ==============================================================================
+
+def test_invoke_holds_and_releases_concurrency_slot(runtime, cache_env):
+    cache_env.setenv("DEEPEVAL_NO_CACHE", "1")
+    assert bedrock_client.invoke_qwen("app", "prompt", 16, 0.0) == "reply from app"
+    assert runtime.calls == [("app", 1)]
+    assert bedrock_client.concurrency._in_flight == 0
+
+
+# ==============================================================================
+# WARM-UP
+# ==============================================================================
+
+def test_warm_up_pings_each_model_in_a_concurrency_slot(runtime, cache_env):
+    bedrock_client.warm_up("app", "judge")
+    assert sorted(runtime.calls) == [("app", 1), ("judge", 1)]
+    assert bedrock_client.concurrency._in_flight == 0
+
+
+def test_warm_up_skips_replayed_models(runtime, cache_env):
+    cache_env.setenv("DEEPEVAL_REPLAY_MODELS", "app")
+    bedrock_client.warm_up("app", "judge")
+    assert runtime.calls == [("judge", 1)]
+
+
+def test_warm_up_skips_all_models_in_replay_mode(runtime, cache_env):
+    cache_env.setenv("DEEPEVAL_CACHE_MODE", "replay")
+    bedrock_client.warm_up("app", "judge")
+    assert runtime.calls == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,70 @@
+"""
+Bedrock Qwen Client Unit Tests
+
+Offline tests for batching several questions into one request; Bedrock is
+replaced by a stub.
+"""
+import pytest
+
+import bedrock_qwen
+from bedrock_qwen import BATCH_SEPARATOR, call_qwen_batch
+
+
+@pytest.fixture
+def qwen_calls(monkeypatch):
+    """
+    Stub call_qwen.
+
+    Batched prompts get the reply in replies["batch"]; single prompts are echoed.
+    """
+    calls = []
+    replies = {}
+
+    def call(prompt, max_tokens=512, temperature=0.2):
+        calls.append(prompt)
+        if "Answer each question" in prompt:
+            return replies["batch"]
+        return f"single: {prompt}"
+
+    monkeypatch.setattr(bedrock_qwen, "call_qwen", call)
+    return calls, replies
+
+
+class TestCallQwenBatch:
+    """Tests for splitting, label stripping and fallback."""
+
+    def test_split_and_strip_labels(self, qwen_calls):
+        calls, replies = qwen_calls
+        replies["batch"] = BATCH_SEPARATOR.join(["1. Paris", "2) Tokyo"])
+        assert call_qwen_batch(["q1", "q2"]) == ["Paris", "Tokyo"]
+        assert len(calls) == 1
+
+    def test_leading_decimal_kept(self, qwen_calls):
+        _, replies = qwen_calls
+        replies["batch"] = BATCH_SEPARATOR.join(["3.00 × 10^8 m/s", "2. Tokyo"])
+        assert call_qwen_batch(["q1", "q2"]) == ["3.00 × 10^8 m/s", "Tokyo"]
+
+    def test_only_expected_index_stripped(self, qwen_calls):
+        _, replies = qwen_calls
+        replies["batch"] = BATCH_SEPARATOR.join(["Paris", "1. Tokyo"])
+        assert call_qwen_batch(["q1", "q2"]) == ["Paris", "1. Tokyo"]
+
+    def test_fallback_on_answer_count_mismatch(self, qwen_calls):
+        calls, replies = qwen_calls
+        replies["batch"] = "1. Paris and 2. Tokyo"
+        assert call_qwen_batch(["q1", "q2"]) == ["single: q1", "single: q2"]
+        assert len(calls) == 3
+
+    def test_fallback_on_empty_answer(self, qwen_calls):
+        _, replies = qwen_calls
+        replies["batch"] = BATCH_SEPARATOR.join(["1. Paris", "2. "])
+        assert call_qwen_batch(["q1", "q2"]) == ["single: q1", "single: q2"]
+
+    def test_single_prompt_not_batched(self, qwen_calls):
+        calls, _ = qwen_calls
+        assert call_qwen_batch(["q1"]) == ["single: q1"]
+        assert calls == ["q1"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
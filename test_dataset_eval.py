@@ -11,107 +11,244 @@ Dataset-based evaluation is useful for:
 - Benchmarking model performance
 - Regression testing
 """
+import asyncio
+from collections import Counter
+
 import pytest
 from deepeval import evaluate
 from deepeval.dataset import EvaluationDataset
-from deepeval.metrics import AnswerRelevancyMetric, FaithfulnessMetric
+from deepeval.evaluate import ErrorConfig
 from deepeval.test_case import LLMTestCase
 
-from bedrock_qwen import call_qwen, call_qwen_with_context
-from qwen_judge import QwenJudge
+import bedrock_batch
+import metrics_registry
+from bedrock_qwen import a_call_qwen, build_context_prompt
 
-# Initialize the judge model
-qwen_judge = QwenJudge()
 
 # Define metrics for dataset evaluation
-answer_relevancy = AnswerRelevancyMetric(model=qwen_judge, threshold=0.7)
-faithfulness = FaithfulnessMetric(model=qwen_judge, threshold=0.7)
+@pytest.fixture(scope="session")
+def eval_metrics(qwen_judge):
+    """Dataset metrics, shared with other modules via metrics_registry."""
+    return {
+        "answer_relevancy": metrics_registry.answer_relevancy(threshold=0.7),
+        "faithfulness": metrics_registry.faithfulness(threshold=0.7),
+    }
 
 
 # ==============================================================================
 # DATASET DEFINITIONS
 # ==============================================================================
 
-def create_factual_qa_dataset() -> EvaluationDataset:
+async def generate_outputs(
+    prompts: list[str], temperature: float | list[float] = 0.2
+) -> list[str]:
     """
-    Create a dataset of factual Q&A test cases.
+    Generate model outputs for all prompts concurrently.
+    
+    Uses a Bedrock batch inference job instead when USE_BEDROCK_BATCH=1
+    (bedrock_batch.run falls back to on-demand calls for small prompt sets).
+    
+    Args:
+        prompts: Prompts to send to the application model
+        temperature: Sampling temperature (0.0-1.0), or one per prompt
     
     Returns:
-        EvaluationDataset with factual Q&A test cases
+        Model outputs in the same order as prompts
+    """
+    if bedrock_batch.is_enabled():
+        return await asyncio.to_thread(bedrock_batch.run, prompts, temperature=temperature)
+    temperatures = temperature if isinstance(temperature, list) else [temperature] * len(prompts)
+    return await asyncio.gather(
+        *(a_call_qwen(p, temperature=t) for p, t in zip(prompts, temperatures))
+    )
+
+
+FACTUAL_QA_PAIRS = [
+    ("What is the chemical symbol for water?", "H2O"),
+    ("What is the largest ocean on Earth?", "Pacific Ocean"),
+    ("Who wrote Romeo and Juliet?", "William Shakespeare"),
+    ("What is the capital of Japan?", "Tokyo"),
+    ("What planet is known as the Red Planet?", "Mars"),
+]
+
+
+def create_factual_qa_dataset(actual_outputs: list[str]) -> EvaluationDataset:
     """
-    test_cases = []
+    Create a dataset of factual Q&A test cases.
     
-    # Define Q&A pairs
-    qa_pairs = [
-        ("What is the chemical symbol for water?", "H2O"),
-        ("What is the largest ocean on Earth?", "Pacific Ocean"),
-        ("Who wrote Romeo and Juliet?", "William Shakespeare"),
-        ("What is the capital of Japan?", "Tokyo"),
-        ("What planet is known as the Red Planet?", "Mars"),
-    ]
+    Args:
+        actual_outputs: Model outputs in the same order as FACTUAL_QA_PAIRS
     
-    for question, expected in qa_pairs:
-        actual = call_qwen(question)
-        test_cases.append(
-            LLMTestCase(
-                input=question,
-                actual_output=actual,
-                expected_output=expected,
-            )
+    Returns:
+        EvaluationDataset with factual Q&A test cases
+    """
+    test_cases = [
+        LLMTestCase(
+            input=question,
+            actual_output=actual,
+            expected_output=expected,
         )
+        for (question, expected), actual in zip(FACTUAL_QA_PAIRS, actual_outputs)
+    ]
     
     return EvaluationDataset(test_cases=test_cases)
 
 
-def create_rag_dataset() -> EvaluationDataset:
+RAG_DATA = [
+    {
+        "question": "When was SpaceX founded?",
+        "context": [
+            "SpaceX was founded in 2002 by Elon Musk.",
+            "The company is headquartered in Hawthorne, California.",
+        ],
+        "expected": "SpaceX was founded in 2002.",
+    },
+    {
+        "question": "What does NASA stand for?",
+        "context": [
+            "NASA stands for National Aeronautics and Space Administration.",
+            "NASA was established in 1958.",
+        ],
+        "expected": "NASA stands for National Aeronautics and Space Administration.",
+    },
+    {
+        "question": "What is the main ingredient in bread?",
+        "context": [
+            "Bread is made primarily from flour.",
+            "Other common ingredients include water, yeast, and salt.",
+        ],
+        "expected": "Flour is the main ingredient in bread.",
+    },
+]
+
+
+def create_rag_dataset(actual_outputs: list[str]) -> EvaluationDataset:
     """
     Create a dataset of RAG-style test cases with retrieval context.
     
+    Args:
+        actual_outputs: Model outputs in the same order as RAG_DATA
+    
     Returns:
         EvaluationDataset with RAG test cases
     """
-    test_cases = []
-    
-    # Define RAG test data
-    rag_data = [
-        {
-            "question": "When was SpaceX founded?",
-            "context": [
-                "SpaceX was founded in 2002 by Elon Musk.",
-                "The company is headquartered in Hawthorne, California.",
-            ],
-            "expected": "SpaceX was founded in 2002.",
-        },
-        {
-            "question": "What does NASA stand for?",
-            "context": [
-                "NASA stands for National Aeronautics and Space Administration.",
-                "NASA was established in 1958.",
-            ],
-            "expected": "NASA stands for National Aeronautics and Space Administration.",
-        },
-        {
-            "question": "What is the main ingredient in bread?",
-            "context": [
-                "Bread is made primarily from flour.",
-                "Other common ingredients include water, yeast, and salt.",
-            ],
-            "expected": "Flour is the main ingredient in bread.",
-        },
+    test_cases = [
+        LLMTestCase(
+            input=item["question"],
+            actual_output=actual,
+            expected_output=item["expected"],
+            retrieval_context=item["context"],
+        )
+        for item, actual in zip(RAG_DATA, actual_outputs)
     ]
     
-    for item in rag_data:
-        actual = call_qwen_with_context(item["question"], item["context"])
-        test_cases.append(
-            LLMTestCase(
-                input=item["question"],
-                actual_output=actual,
-                expected_output=item["expected"],
-                retrieval_context=item["context"],
-            )
+    return EvaluationDataset(test_cases=test_cases)
+
+
+BENCHMARK_QUESTIONS = [
+    {
+        "input": "What is the speed of light?",
+        "category": "physics",
+    },
+    {
+        "input": "Who painted the Mona Lisa?",
+        "category": "art",
+    },
+    {
+        "input": "What is the largest mammal?",
+        "category": "biology",
+    },
+    {
+        "input": "What year did World War II end?",
+        "category": "history",
+    },
+]
+
+
+def create_benchmark_test_cases(actual_outputs: list[str]) -> list[LLMTestCase]:
+    """
+    Create general knowledge benchmark test cases tagged with a category.
+    
+    Args:
+        actual_outputs: Model outputs in the same order as BENCHMARK_QUESTIONS
+    
+    Returns:
+        Test cases in the same order as BENCHMARK_QUESTIONS
+    """
+    return [
+        LLMTestCase(
+            input=item["input"],
+            actual_output=actual,
+            additional_metadata={"category": item["category"]},
         )
+        for item, actual in zip(BENCHMARK_QUESTIONS, actual_outputs)
+    ]
+
+
+async def create_all_datasets() -> dict[str, list[LLMTestCase]]:
+    """
+    Build the factual, RAG and benchmark test cases.
     
-    return EvaluationDataset(test_cases=test_cases)
+    Every dataset's prompts are generated in one pooled generate_outputs call,
+    so batch mode submits a single job instead of one per dataset.
+    
+    Returns:
+        Mapping of dataset name to its test cases
+    """
+    factual_prompts = [question for question, _ in FACTUAL_QA_PAIRS]
+    rag_prompts = [build_context_prompt(item["question"], item["context"]) for item in RAG_DATA]
+    benchmark_prompts = [item["input"] for item in BENCHMARK_QUESTIONS]
+    outputs = await generate_outputs(
+        factual_prompts + rag_prompts + benchmark_prompts,
+        temperature=(
+            [0.2] * len(factual_prompts)
+            + [0.1] * len(rag_prompts)  # Same as call_qwen_with_context
+            + [0.2] * len(benchmark_prompts)
+        ),
+    )
+    rag_start = len(factual_prompts)
+    benchmark_start = rag_start + len(rag_prompts)
+    return {
+        "factual": create_factual_qa_dataset(outputs[:rag_start]).test_cases,
+        "rag": create_rag_dataset(outputs[rag_start:benchmark_start]).test_cases,
+        "benchmark": create_benchmark_test_cases(outputs[benchmark_start:]),
+    }
+
+
+@pytest.fixture(scope="session")
+def dataset_results(eval_metrics):
+    """
+    Evaluate all dataset test cases in a single evaluate() call.
+    
+    Answer relevancy runs on every case; faithfulness is skipped for cases
+    without retrieval context.
+    
+    Returns:
+        Mapping of dataset name to TestResults, in test case order
+    """
+    datasets = asyncio.run(create_all_datasets())
+    results = evaluate(
+        test_cases=[tc for cases in datasets.values() for tc in cases],
+        metrics=[eval_metrics["answer_relevancy"], eval_metrics["faithfulness"]],
+        error_config=ErrorConfig(skip_on_missing_params=True),
+    )
+    # Async evaluation returns results in completion order, so match by input
+    by_input = {tr.input: tr for tr in results.test_results}
+    return {name: [by_input[tc.input] for tc in cases] for name, cases in datasets.items()}
+
+
+def pass_flags(test_results, metric) -> list[bool]:
+    """
+    Return, per test result, whether the given metric was measured and passed.
+    
+    Computed once per evaluation; pass counts and category breakdowns are
+    then plain sums over this list.
+    """
+    name = metric.__name__
+    return [
+        any(md.name == name and md.success for md in tr.metrics_data or [])
+        for tr in test_results
+    ]
 
 
 # ==============================================================================
@@ -121,22 +258,17 @@ def create_rag_dataset() -> EvaluationDataset:
 class TestDatasetEvaluation:
     """Tests using dataset-based evaluation."""
     
-    def test_factual_qa_dataset(self):
+    def test_factual_qa_dataset(self, dataset_results, eval_metrics):
         """Evaluate factual Q&A dataset with answer relevancy."""
-        dataset = create_factual_qa_dataset()
-        
-        # Run evaluation
-        results = evaluate(
-            test_cases=dataset.test_cases,
-            metrics=[answer_relevancy],
-        )
+        results = dataset_results["factual"]
         
         # Check that evaluation completed
-        assert results is not None
+        assert results, "No factual QA results"
         
         # Check pass rate
-        passed = sum(1 for tc in results.test_results if tc.success)
-        total = len(results.test_results)
+        flags = pass_flags(results, eval_metrics["answer_relevancy"])
+        passed = sum(flags)
+        total = len(flags)
         pass_rate = passed / total if total > 0 else 0
         
         print(f"Factual QA Pass Rate: {pass_rate:.2%} ({passed}/{total})")
@@ -144,22 +276,17 @@ class TestDatasetEvaluation:
         # Assert minimum pass rate
         assert pass_rate >= 0.6, f"Pass rate {pass_rate:.2%} below threshold 60%"
     
-    def test_rag_dataset(self):
+    def test_rag_dataset(self, dataset_results, eval_metrics):
         """Evaluate RAG dataset with faithfulness metric."""
-        dataset = create_rag_dataset()
-        
-        # Run evaluation
-        results = evaluate(
-            test_cases=dataset.test_cases,
-            metrics=[faithfulness],
-        )
+        results = dataset_results["rag"]
         
         # Check that evaluation completed
-        assert results is not None
+        assert results, "No RAG results"
         
         # Check pass rate
-        passed = sum(1 for tc in results.test_results if tc.success)
-        total = len(results.test_results)
+        flags = pass_flags(results, eval_metrics["faithfulness"])
+        passed = sum(flags)
+        total = len(flags)
         pass_rate = passed / total if total > 0 else 0
         
         print(f"RAG Faithfulness Pass Rate: {pass_rate:.2%} ({passed}/{total})")
@@ -175,7 +302,7 @@ class TestDatasetEvaluation:
 class TestInlineDataset:
     """Tests with inline dataset definition."""
     
-    def test_coding_questions_dataset(self):
+    def test_coding_questions_dataset(self, eval_metrics):
         """Test dataset of coding questions."""
         questions = [
             "What is a variable in programming?",
@@ -183,20 +310,20 @@ class TestInlineDataset:
             "What is a loop in programming?",
         ]
         
-        test_cases = []
-        for q in questions:
-            test_cases.append(
-                LLMTestCase(
-                    input=q,
-                    actual_output=call_qwen(q),
-                )
+        actual_outputs = asyncio.run(generate_outputs(questions))
+        test_cases = [
+            LLMTestCase(
+                input=q,
+                actual_output=actual,
             )
+            for q, actual in zip(questions, actual_outputs)
+        ]
         
         dataset = EvaluationDataset(test_cases=test_cases)
         
         results = evaluate(
             test_cases=dataset.test_cases,
-            metrics=[answer_relevancy],
+            metrics=[eval_metrics["answer_relevancy"]],
         )
         
         assert results is not None
@@ -210,62 +337,22 @@ class TestInlineDataset:
 class TestBenchmark:
     """Benchmark-style evaluation tests."""
     
-    def test_general_knowledge_benchmark(self):
+    def test_general_knowledge_benchmark(self, dataset_results, eval_metrics):
         """Run a general knowledge benchmark."""
-        benchmark_questions = [
-            {
-                "input": "What is the speed of light?",
-                "category": "physics",
-            },
-            {
-                "input": "Who painted the Mona Lisa?",
-                "category": "art",
-            },
-            {
-                "input": "What is the largest mammal?",
-                "category": "biology",
-            },
-            {
-                "input": "What year did World War II end?",
-                "category": "history",
-            },
-        ]
-        
-        test_cases = []
-        for item in benchmark_questions:
-            test_cases.append(
-                LLMTestCase(
-                    input=item["input"],
-                    actual_output=call_qwen(item["input"]),
-                    additional_metadata={"category": item["category"]},
-                )
-            )
-        
-        results = evaluate(
-            test_cases=test_cases,
-            metrics=[answer_relevancy],
-        )
+        flags = pass_flags(dataset_results["benchmark"], eval_metrics["answer_relevancy"])
         
         # Aggregate results
-        categories = {}
-        for i, tc in enumerate(results.test_results):
-            cat = benchmark_questions[i]["category"]
-            if cat not in categories:
-                categories[cat] = {"passed": 0, "total": 0}
-            categories[cat]["total"] += 1
-            if tc.success:
-                categories[cat]["passed"] += 1
+        cats = [item["category"] for item in BENCHMARK_QUESTIONS]
+        totals = Counter(cats)
+        passed = Counter(cat for cat, ok in zip(cats, flags) if ok)
         
         # Print category breakdown
         print("\nBenchmark Results by Category:")
-        for cat, scores in categories.items():
-            rate = scores["passed"] / scores["total"]
-            print(f"  {cat}: {rate:.2%}")
+        for cat, total in totals.items():
+            print(f"  {cat}: {passed[cat] / total:.2%}")
         
         # Overall pass rate check
-        total_passed = sum(c["passed"] for c in categories.values())
-        total = sum(c["total"] for c in categories.values())
-        overall_rate = total_passed / total if total > 0 else 0
+        overall_rate = sum(flags) / len(flags) if flags else 0
         
         assert overall_rate >= 0.5, f"Benchmark pass rate {overall_rate:.2%} below 50%"
 
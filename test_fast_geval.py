@@ -0,0 +1,58 @@
+"""
+FastGEval Unit Tests
+
+Offline tests that FastGEval sends the judge exactly the prompt GEval would.
+FastGEval overrides private DeepEval internals, so upstream template or
+signature changes fail here instead of silently changing scores.
+"""
+import pytest
+from deepeval.metrics import GEval
+from deepeval.metrics.g_eval import Rubric
+from deepeval.test_case import LLMTestCase, SingleTurnParams
+
+from fast_geval import FastGEval
+from qwen_judge import QwenJudge
+
+RUBRIC = [
+    Rubric(score_range=(0, 4), expected_outcome="Incorrect or unclear."),
+    Rubric(score_range=(5, 10), expected_outcome="Correct and clear."),
+]
+
+
+def build(metric_class, strict_mode, rubric):
+    return metric_class(
+        name="Clarity",
+        model=QwenJudge(),
+        evaluation_params=[
+            SingleTurnParams.INPUT,
+            SingleTurnParams.ACTUAL_OUTPUT,
+            SingleTurnParams.EXPECTED_OUTPUT,
+        ],
+        evaluation_steps=[
+            "Check whether the actual output answers the input.",
+            "Compare the actual output with the expected output.",
+        ],
+        rubric=rubric,
+        strict_mode=strict_mode,
+    )
+
+
+@pytest.mark.parametrize("multimodal", [False, True], ids=["text", "multimodal"])
+@pytest.mark.parametrize("rubric", [None, RUBRIC], ids=["no_rubric", "rubric"])
+@pytest.mark.parametrize("strict_mode", [False, True], ids=["lenient", "strict"])
+def test_results_prompt_matches_geval(strict_mode, rubric, multimodal):
+    test_case = LLMTestCase(
+        input="What is a closure?",
+        actual_output="A function that captures variables from its enclosing scope.",
+        expected_output="A function bundled with references to its surrounding state.",
+    )
+    fast = build(FastGEval, strict_mode, rubric)
+    reference = build(GEval, strict_mode, rubric)
+    expected = reference._results_prompt(test_case, multimodal, None)
+    # Twice: once rendering the cached prefix/suffix, once reusing them
+    assert fast._results_prompt(test_case, multimodal, None) == expected
+    assert fast._results_prompt(test_case, multimodal, None) == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,41 @@
+"""
+Fused RAG Metric Unit Tests
+
+Offline tests for scoring the fused judge reply; no Bedrock calls are made.
+"""
+import pytest
+
+from fused_rag_metric import FusedRAGMetric
+from qwen_judge import QwenJudge
+
+
+@pytest.fixture
+def metric():
+    return FusedRAGMetric(model=QwenJudge(), threshold=0.7)
+
+
+def test_score_is_lowest_criterion(metric):
+    reply = '{"precision": 0.9, "recall": "0.8", "relevancy": 0.75, "reasons": {"recall": "ok"}}'
+    assert metric._score(reply) == 0.75
+    assert metric.score_breakdown == {"precision": 0.9, "recall": 0.8, "relevancy": 0.75}
+    assert metric.success
+    assert "recall 0.80: ok" in metric.reason
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        pytest.param('{"precision": 9, "recall": 8, "relevancy": 10}', id="ten_point_scale"),
+        pytest.param('{"precision": 0.9, "recall": 0.8}', id="missing_key"),
+        pytest.param('{"precision": 0.9, "recall": "high", "relevancy": 0.8}', id="not_a_number"),
+        pytest.param('{"precision": true, "recall": 0.8, "relevancy": 0.8}', id="boolean"),
+    ],
+)
+def test_invalid_scores_raise_metric_error(metric, reply):
+    with pytest.raises(ValueError):
+        metric._score(reply)
+    assert metric.error
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -11,92 +11,86 @@ This file demonstrates:
 """
 import pytest
 from deepeval import assert_test
-from deepeval.metrics import GEval
 from deepeval.test_case import LLMTestCase, LLMTestCaseParams
 
+import metrics_registry
 from bedrock_qwen import call_qwen
-from qwen_judge import QwenJudge
-
-# Initialize the judge model
-qwen_judge = QwenJudge()
 
 
 # ==============================================================================
 # CUSTOM G-EVAL METRICS
 # ==============================================================================
 
-# Custom metric: Code Quality
-code_quality_metric = GEval(
-    name="Code Quality",
-    model=qwen_judge,
-    evaluation_params=[
-        LLMTestCaseParams.INPUT,
-        LLMTestCaseParams.ACTUAL_OUTPUT,
-    ],
-    criteria=(
-        "Evaluate the code quality of the response. Consider: "
-        "1. Correctness - Does the code solve the problem? "
-        "2. Readability - Is the code easy to understand? "
-        "3. Best practices - Does it follow coding conventions? "
-        "4. Efficiency - Is the solution reasonably efficient?"
-    ),
-    threshold=0.7,
-)
-
-# Custom metric: Explanation Clarity
-explanation_clarity_metric = GEval(
-    name="Explanation Clarity",
-    model=qwen_judge,
-    evaluation_params=[
-        LLMTestCaseParams.INPUT,
-        LLMTestCaseParams.ACTUAL_OUTPUT,
-    ],
-    criteria=(
-        "Evaluate how clear and understandable the explanation is. Consider: "
-        "1. Structure - Is the explanation well-organized? "
-        "2. Simplicity - Are complex concepts broken down? "
-        "3. Completeness - Are all key points covered? "
-        "4. Examples - Are helpful examples provided when appropriate?"
-    ),
-    threshold=0.7,
-)
-
-# Custom metric: Technical Accuracy
-technical_accuracy_metric = GEval(
-    name="Technical Accuracy",
-    model=qwen_judge,
-    evaluation_params=[
-        LLMTestCaseParams.INPUT,
-        LLMTestCaseParams.ACTUAL_OUTPUT,
-        LLMTestCaseParams.EXPECTED_OUTPUT,
-    ],
-    criteria=(
-        "Evaluate the technical accuracy of the response compared to expected output. "
-        "1. Factual correctness - Are stated facts accurate? "
-        "2. Technical terminology - Is terminology used correctly? "
-        "3. Alignment - Does output align with expected answer? "
-        "4. No misinformation - Are there any incorrect statements?"
-    ),
-    threshold=0.7,
-)
-
-# Custom metric: Response Conciseness
-conciseness_metric = GEval(
-    name="Conciseness",
-    model=qwen_judge,
-    evaluation_params=[
-        LLMTestCaseParams.INPUT,
-        LLMTestCaseParams.ACTUAL_OUTPUT,
-    ],
-    criteria=(
-        "Evaluate how concise the response is while remaining complete. "
-        "1. No unnecessary repetition "
-        "2. Direct and to the point "
-        "3. Appropriate length for the question "
-        "4. No filler content or excessive verbosity"
-    ),
-    threshold=0.6,
-)
+@pytest.fixture(scope="session")
+def eval_metrics(qwen_judge):
+    """Custom G-Eval metrics, shared via metrics_registry."""
+    return {
+        # Custom metric: Code Quality
+        "code_quality": metrics_registry.geval(
+            name="Code Quality",
+            params=(
+                LLMTestCaseParams.INPUT,
+                LLMTestCaseParams.ACTUAL_OUTPUT,
+            ),
+            criteria=(
+                "Evaluate the code quality of the response. Consider: "
+                "1. Correctness - Does the code solve the problem? "
+                "2. Readability - Is the code easy to understand? "
+                "3. Best practices - Does it follow coding conventions? "
+                "4. Efficiency - Is the solution reasonably efficient?"
+            ),
+            threshold=0.7,
+        ),
+        # Custom metric: Explanation Clarity
+        "explanation_clarity": metrics_registry.geval(
+            name="Explanation Clarity",
+            params=(
+                LLMTestCaseParams.INPUT,
+                LLMTestCaseParams.ACTUAL_OUTPUT,
+            ),
+            criteria=(
+                "Evaluate how clear and understandable the explanation is. Consider: "
+                "1. Structure - Is the explanation well-organized? "
+                "2. Simplicity - Are complex concepts broken down? "
+                "3. Completeness - Are all key points covered? "
+                "4. Examples - Are helpful examples provided when appropriate?"
+            ),
+            threshold=0.7,
+        ),
+        # Custom metric: Technical Accuracy
+        "technical_accuracy": metrics_registry.geval(
+            name="Technical Accuracy",
+            params=(
+                LLMTestCaseParams.INPUT,
+                LLMTestCaseParams.ACTUAL_OUTPUT,
+                LLMTestCaseParams.EXPECTED_OUTPUT,
+            ),
+            criteria=(
+                "Evaluate the technical accuracy of the response compared to expected output. "
+                "1. Factual correctness - Are stated facts accurate? "
+                "2. Technical terminology - Is terminology used correctly? "
+                "3. Alignment - Does output align with expected answer? "
+                "4. No misinformation - Are there any incorrect statements?"
+            ),
+            threshold=0.7,
+        ),
+        # Custom metric: Response Conciseness
+        "conciseness": metrics_registry.geval(
+            name="Conciseness",
+            params=(
+                LLMTestCaseParams.INPUT,
+                LLMTestCaseParams.ACTUAL_OUTPUT,
+            ),
+            criteria=(
+                "Evaluate how concise the response is while remaining complete. "
+                "1. No unnecessary repetition "
+                "2. Direct and to the point "
+                "3. Appropriate length for the question "
+                "4. No filler content or excessive verbosity"
+            ),
+            threshold=0.6,
+        ),
+    }
 
 
 # ==============================================================================
@@ -106,7 +100,7 @@ conciseness_metric = GEval(
 class TestCodeQuality:
     """Tests using custom Code Quality G-Eval metric."""
     
-    def test_python_function_quality(self):
+    def test_python_function_quality(self, eval_metrics):
         """Test quality of generated Python function."""
         test_input = "Write a Python function to check if a number is prime."
         actual_output = call_qwen(test_input)
@@ -115,9 +109,9 @@ class TestCodeQuality:
             input=test_input,
             actual_output=actual_output,
         )
-        assert_test(test_case, metrics=[code_quality_metric])
+        assert_test(test_case, metrics=[eval_metrics["code_quality"]])
     
-    def test_sorting_algorithm(self):
+    def test_sorting_algorithm(self, eval_metrics):
         """Test quality of sorting implementation."""
         test_input = "Write a Python function to sort a list using bubble sort."
         actual_output = call_qwen(test_input)
@@ -126,7 +120,7 @@ class TestCodeQuality:
             input=test_input,
             actual_output=actual_output,
         )
-        assert_test(test_case, metrics=[code_quality_metric])
+        assert_test(test_case, metrics=[eval_metrics["code_quality"]])
 
 
 # ==============================================================================
@@ -136,7 +130,7 @@ class TestCodeQuality:
 class TestExplanationClarity:
     """Tests using custom Explanation Clarity G-Eval metric."""
     
-    def test_technical_concept_explanation(self):
+    def test_technical_concept_explanation(self, eval_metrics):
         """Test clarity of technical concept explanation."""
         test_input = "Explain what a REST API is to a beginner."
         actual_output = call_qwen(test_input)
@@ -145,9 +139,9 @@ class TestExplanationClarity:
             input=test_input,
             actual_output=actual_output,
         )
-        assert_test(test_case, metrics=[explanation_clarity_metric])
+        assert_test(test_case, metrics=[eval_metrics["explanation_clarity"]])
     
-    def test_algorithm_explanation(self):
+    def test_algorithm_explanation(self, eval_metrics):
         """Test clarity of algorithm explanation."""
         test_input = "Explain how binary search works step by step."
         actual_output = call_qwen(test_input)
@@ -156,7 +150,7 @@ class TestExplanationClarity:
             input=test_input,
             actual_output=actual_output,
         )
-        assert_test(test_case, metrics=[explanation_clarity_metric])
+        assert_test(test_case, metrics=[eval_metrics["explanation_clarity"]])
 
 
 # ==============================================================================
@@ -166,7 +160,7 @@ class TestExplanationClarity:
 class TestTechnicalAccuracy:
     """Tests using custom Technical Accuracy G-Eval metric."""
     
-    def test_programming_fact(self):
+    def test_programming_fact(self, eval_metrics):
         """Test technical accuracy of programming facts."""
         test_input = "What are the main features of Python?"
         expected_output = (
@@ -181,9 +175,9 @@ class TestTechnicalAccuracy:
             actual_output=actual_output,
             expected_output=expected_output,
         )
-        assert_test(test_case, metrics=[technical_accuracy_metric])
+        assert_test(test_case, metrics=[eval_metrics["technical_accuracy"]])
     
-    def test_database_concept(self):
+    def test_database_concept(self, eval_metrics):
         """Test technical accuracy of database concepts."""
         test_input = "What is the difference between SQL and NoSQL databases?"
         expected_output = (
@@ -198,7 +192,7 @@ class TestTechnicalAccuracy:
             actual_output=actual_output,
             expected_output=expected_output,
         )
-        assert_test(test_case, metrics=[technical_accuracy_metric])
+        assert_test(test_case, metrics=[eval_metrics["technical_accuracy"]])
 
 
 # ==============================================================================
@@ -208,7 +202,7 @@ class TestTechnicalAccuracy:
 class TestConciseness:
     """Tests using custom Conciseness G-Eval metric."""
     
-    def test_short_answer(self):
+    def test_short_answer(self, eval_metrics):
         """Test conciseness for short answer question."""
         test_input = "What is the time complexity of binary search?"
         actual_output = call_qwen(test_input)
@@ -217,7 +211,7 @@ class TestConciseness:
             input=test_input,
             actual_output=actual_output,
         )
-        assert_test(test_case, metrics=[conciseness_metric])
+        assert_test(test_case, metrics=[eval_metrics["conciseness"]])
 
 
 # ==============================================================================
@@ -227,7 +221,7 @@ class TestConciseness:
 class TestCombinedCustomMetrics:
     """Tests combining multiple custom G-Eval metrics."""
     
-    def test_code_with_explanation(self):
+    def test_code_with_explanation(self, eval_metrics):
         """Test code generation with both quality and clarity metrics."""
         test_input = (
             "Write a Python function to find the longest common subsequence "
@@ -242,7 +236,7 @@ class TestCombinedCustomMetrics:
         
         assert_test(
             test_case,
-            metrics=[code_quality_metric, explanation_clarity_metric]
+            metrics=[eval_metrics["code_quality"], eval_metrics["explanation_clarity"]]
         )
 
 
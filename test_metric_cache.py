@@ -0,0 +1,142 @@
+"""
+Metric Cache Unit Tests
+
+Offline tests for the CI_INCREMENTAL metric result cache; a stub metric stands
+in for the judge.
+"""
+import asyncio
+
+import pytest
+from deepeval.metrics import BaseMetric
+from deepeval.test_case import LLMTestCase
+
+import metric_cache
+
+
+class StubMetric(BaseMetric):
+    """Metric that scores from a counter, so re-judging is visible."""
+
+    def __init__(self, threshold: float = 0.7, criteria: str = "Be correct."):
+        self.threshold = threshold
+        self.criteria = criteria
+        self.calls = 0
+
+    def _judge(self) -> float:
+        self.calls += 1
+        self.score = 0.9
+        self.reason = f"judged {self.calls} time(s)"
+        self.success = self.is_successful()
+        self.error = None
+        return self.score
+
+    def measure(self, test_case, *args, **kwargs) -> float:
+        return self._judge()
+
+    async def a_measure(self, test_case, *args, **kwargs) -> float:
+        return self._judge()
+
+    def is_successful(self) -> bool:
+        return self.score >= self.threshold
+
+    @property
+    def __name__(self):
+        return "Stub"
+
+
+@pytest.fixture(autouse=True)
+def installed(tmp_path, monkeypatch):
+    """Install the cache on StubMetric only, backed by a temporary directory."""
+    monkeypatch.setattr(metric_cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(metric_cache, "CACHED_METRICS", (StubMetric,))
+    monkeypatch.setattr(StubMetric, "measure", StubMetric.measure)
+    monkeypatch.setattr(StubMetric, "a_measure", StubMetric.a_measure)
+    metric_cache.install()
+    return tmp_path
+
+
+def case(actual_output: str = "Paris") -> LLMTestCase:
+    return LLMTestCase(input="What is the capital of France?", actual_output=actual_output)
+
+
+# ==============================================================================
+# HITS
+# ==============================================================================
+
+class TestHit:
+    """Tests for restoring recorded results."""
+
+    def test_restores_score_reason_and_success(self):
+        StubMetric().measure(case())
+        metric = StubMetric()
+        assert metric.measure(case()) == 0.9
+        assert metric.calls == 0
+        assert metric.reason == "judged 1 time(s)"
+        assert metric.success is True
+        assert metric.error is None
+
+    def test_async_measure_shares_cache(self):
+        StubMetric().measure(case())
+        metric = StubMetric()
+        assert asyncio.run(metric.a_measure(case())) == 0.9
+        assert metric.calls == 0
+
+    def test_errored_result_not_stored(self):
+        metric = StubMetric()
+        metric._judge = lambda: setattr(metric, "error", "bad JSON") or 0.0
+        metric.measure(case())
+        assert not list(metric_cache.CACHE_DIR.glob("*.json"))
+
+
+# ==============================================================================
+# MISSES
+# ==============================================================================
+
+def rejudged(first: StubMetric, second: StubMetric, first_case=None, second_case=None) -> bool:
+    """Measure with first, then second; True if second called the judge."""
+    first.measure(first_case or case())
+    second.measure(second_case or case())
+    return second.calls == 1
+
+
+class TestMiss:
+    """Tests that every input to the result is part of the key."""
+
+    def test_threshold_change(self):
+        assert rejudged(StubMetric(threshold=0.7), StubMetric(threshold=0.8))
+
+    def test_criteria_change(self):
+        assert rejudged(StubMetric(criteria="Be correct."), StubMetric(criteria="Be brief."))
+
+    def test_output_change(self):
+        assert rejudged(StubMetric(), StubMetric(), case("Paris"), case("Lyon"))
+
+    def test_strict_mode_change(self):
+        strict = StubMetric()
+        strict.strict_mode = True
+        assert rejudged(StubMetric(), strict)
+
+    def test_judge_model_change(self, monkeypatch):
+        StubMetric().measure(case())
+        monkeypatch.setattr(metric_cache, "JUDGE_MODEL_ID", "another-judge")
+        metric = StubMetric()
+        metric.measure(case())
+        assert metric.calls == 1
+
+    def test_deepeval_version_change(self, monkeypatch):
+        StubMetric().measure(case())
+        monkeypatch.setattr(metric_cache, "DEEPEVAL_VERSION", "0.0.0")
+        metric = StubMetric()
+        metric.measure(case())
+        assert metric.calls == 1
+
+    def test_prompt_template_change(self, monkeypatch):
+        monkeypatch.setattr(StubMetric, "prompt_template", "v1", raising=False)
+        StubMetric().measure(case())
+        monkeypatch.setattr(StubMetric, "prompt_template", "v2")
+        metric = StubMetric()
+        metric.measure(case())
+        assert metric.calls == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -10,40 +10,83 @@ Models:
 - Application Model: Qwen3-32B (qwen.qwen3-32b-v1:0)
 - Judge Model: Qwen3-235B (qwen.qwen3-235b-a22b-2507-v1:0)
 """
+import re
+
 import pytest
 from deepeval import assert_test
-from deepeval.metrics import (
-    AnswerRelevancyMetric,
-    FaithfulnessMetric,
-    HallucinationMetric,
-)
 from deepeval.test_case import LLMTestCase
 
-from bedrock_qwen import call_qwen, call_qwen_with_context
-from qwen_judge import QwenJudge
-
-# Initialize the judge model (Qwen3-235B)
-qwen_judge = QwenJudge()
+import metrics_registry
+from bedrock_qwen import call_qwen_batch, prefetch_answers
 
 
 # ==============================================================================
 # METRIC DEFINITIONS
 # ==============================================================================
 
-answer_relevancy_metric = AnswerRelevancyMetric(
-    model=qwen_judge,
-    threshold=0.7,
-)
+@pytest.fixture(scope="session")
+def eval_metrics(qwen_judge):
+    """Metrics for this module, shared with other modules via metrics_registry."""
+    return {
+        "answer_relevancy": metrics_registry.answer_relevancy(threshold=0.7),
+        "faithfulness": metrics_registry.faithfulness(threshold=0.7),
+        # Lower threshold = stricter (less hallucination allowed)
+        "hallucination": metrics_registry.hallucination(threshold=0.5),
+    }
+
 
-faithfulness_metric = FaithfulnessMetric(
-    model=qwen_judge,
-    threshold=0.7,
-)
+# ==============================================================================
+# TEST INPUTS
+# ==============================================================================
 
-hallucination_metric = HallucinationMetric(
-    model=qwen_judge,
-    threshold=0.5,  # Lower threshold = stricter (less hallucination allowed)
-)
+RELEVANCY_QUESTIONS = [
+    "What is the capital of France?",
+    "Explain how photosynthesis works in simple terms.",
+    "Write a Python function to calculate factorial of a number.",
+]
+
+FACTUAL_QUESTIONS = [
+    ("What is the largest planet in our solar system?", "Jupiter"),
+    ("What is H2O commonly known as?", "water"),
+    ("What is the speed of light approximately?", "speed"),
+]
+
+# Case-insensitive topic matchers, compiled once instead of lowercasing each output
+TOPIC_PATTERNS = {
+    topic: re.compile(re.escape(topic), re.IGNORECASE) for _, topic in FACTUAL_QUESTIONS
+}
+
+# Retrieval context per question for the context-grounded tests
+CONTEXTS = {
+    "When was the Eiffel Tower built and how tall is it?": [
+        "The Eiffel Tower is located in Paris, France.",
+        "It was constructed from 1887 to 1889 as the entrance arch for the 1889 World's Fair.",
+        "The tower is 330 meters tall and was designed by Gustave Eiffel."
+    ],
+    "Who founded Acme Corp and where is it located?": [
+        "Acme Corp was founded in 2010 by John Smith.",
+        "The company is headquartered in San Francisco.",
+        "Acme Corp has 500 employees and revenue of $50 million."
+    ],
+    "Who created Python and when?": [
+        "Python was created by Guido van Rossum.",
+        "Python was first released in 1991.",
+        "Python is known for its simple syntax and readability."
+    ],
+    "What is machine learning and what are its main techniques?": [
+        "Machine learning is a subset of artificial intelligence.",
+        "ML algorithms learn patterns from data without explicit programming.",
+        "Common ML techniques include supervised, unsupervised, and reinforcement learning."
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def qwen_outputs():
+    """Generate every application-model output for this module concurrently."""
+    questions = dict.fromkeys(RELEVANCY_QUESTIONS)
+    questions.update(CONTEXTS)
+    return prefetch_answers(questions)
 
 
 # ==============================================================================
@@ -53,38 +96,38 @@ hallucination_metric = HallucinationMetric(
 class TestAnswerRelevancy:
     """Tests for Answer Relevancy metric - checks if output answers the input."""
     
-    def test_simple_factual_question(self):
+    def test_simple_factual_question(self, eval_metrics, qwen_outputs):
         """Test relevancy for simple factual question."""
         test_input = "What is the capital of France?"
-        actual_output = call_qwen(test_input)
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
             actual_output=actual_output,
         )
-        assert_test(test_case, metrics=[answer_relevancy_metric])
+        assert_test(test_case, metrics=[eval_metrics["answer_relevancy"]])
     
-    def test_explanation_question(self):
+    def test_explanation_question(self, eval_metrics, qwen_outputs):
         """Test relevancy for explanation-type question."""
         test_input = "Explain how photosynthesis works in simple terms."
-        actual_output = call_qwen(test_input)
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
             actual_output=actual_output,
         )
-        assert_test(test_case, metrics=[answer_relevancy_metric])
+        assert_test(test_case, metrics=[eval_metrics["answer_relevancy"]])
     
-    def test_coding_question(self):
+    def test_coding_question(self, eval_metrics, qwen_outputs):
         """Test relevancy for coding question."""
         test_input = "Write a Python function to calculate factorial of a number."
-        actual_output = call_qwen(test_input)
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
             actual_output=actual_output,
         )
-        assert_test(test_case, metrics=[answer_relevancy_metric])
+        assert_test(test_case, metrics=[eval_metrics["answer_relevancy"]])
 
 
 # ==============================================================================
@@ -94,39 +137,31 @@ class TestAnswerRelevancy:
 class TestFaithfulness:
     """Tests for Faithfulness metric - checks if output is faithful to context."""
     
-    def test_faithful_to_context(self):
+    def test_faithful_to_context(self, eval_metrics, qwen_outputs):
         """Test that model response is faithful to provided context."""
-        context = [
-            "The Eiffel Tower is located in Paris, France.",
-            "It was constructed from 1887 to 1889 as the entrance arch for the 1889 World's Fair.",
-            "The tower is 330 meters tall and was designed by Gustave Eiffel."
-        ]
         test_input = "When was the Eiffel Tower built and how tall is it?"
-        actual_output = call_qwen_with_context(test_input, context)
+        context = CONTEXTS[test_input]
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
             actual_output=actual_output,
             retrieval_context=context,
         )
-        assert_test(test_case, metrics=[faithfulness_metric])
+        assert_test(test_case, metrics=[eval_metrics["faithfulness"]])
     
-    def test_company_context(self):
+    def test_company_context(self, eval_metrics, qwen_outputs):
         """Test faithfulness with company-specific context."""
-        context = [
-            "Acme Corp was founded in 2010 by John Smith.",
-            "The company is headquartered in San Francisco.",
-            "Acme Corp has 500 employees and revenue of $50 million."
-        ]
         test_input = "Who founded Acme Corp and where is it located?"
-        actual_output = call_qwen_with_context(test_input, context)
+        context = CONTEXTS[test_input]
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
             actual_output=actual_output,
             retrieval_context=context,
         )
-        assert_test(test_case, metrics=[faithfulness_metric])
+        assert_test(test_case, metrics=[eval_metrics["faithfulness"]])
 
 
 # ==============================================================================
@@ -136,22 +171,18 @@ class TestFaithfulness:
 class TestHallucination:
     """Tests for Hallucination metric - checks if model makes up facts."""
     
-    def test_no_hallucination_with_context(self):
+    def test_no_hallucination_with_context(self, eval_metrics, qwen_outputs):
         """Test that model doesn't hallucinate when given context."""
-        context = [
-            "Python was created by Guido van Rossum.",
-            "Python was first released in 1991.",
-            "Python is known for its simple syntax and readability."
-        ]
         test_input = "Who created Python and when?"
-        actual_output = call_qwen_with_context(test_input, context)
+        context = CONTEXTS[test_input]
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
             actual_output=actual_output,
             context=context,
         )
-        assert_test(test_case, metrics=[hallucination_metric])
+        assert_test(test_case, metrics=[eval_metrics["hallucination"]])
 
 
 # ==============================================================================
@@ -161,15 +192,11 @@ class TestHallucination:
 class TestCombinedMetrics:
     """Tests that evaluate multiple metrics simultaneously."""
     
-    def test_rag_response_quality(self):
+    def test_rag_response_quality(self, eval_metrics, qwen_outputs):
         """Test a RAG response with multiple quality metrics."""
-        context = [
-            "Machine learning is a subset of artificial intelligence.",
-            "ML algorithms learn patterns from data without explicit programming.",
-            "Common ML techniques include supervised, unsupervised, and reinforcement learning."
-        ]
         test_input = "What is machine learning and what are its main techniques?"
-        actual_output = call_qwen_with_context(test_input, context)
+        context = CONTEXTS[test_input]
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
@@ -181,32 +208,29 @@ class TestCombinedMetrics:
         # Test with multiple metrics
         assert_test(
             test_case, 
-            metrics=[answer_relevancy_metric, faithfulness_metric]
+            metrics=[eval_metrics["answer_relevancy"], eval_metrics["faithfulness"]]
         )
 
 
 # ==============================================================================
-# PARAMETRIZED TESTS
+# BATCHED FACTUAL TESTS
 # ==============================================================================
 
-@pytest.mark.parametrize("question,expected_topic", [
-    ("What is the largest planet in our solar system?", "Jupiter"),
-    ("What is H2O commonly known as?", "water"),
-    ("What is the speed of light approximately?", "speed"),
-])
-def test_factual_questions_parametrized(question: str, expected_topic: str):
-    """Parametrized test for multiple factual questions."""
-    actual_output = call_qwen(question)
-    
-    test_case = LLMTestCase(
-        input=question,
-        actual_output=actual_output,
-    )
-    assert_test(test_case, metrics=[answer_relevancy_metric])
+def test_factual_questions_batched(eval_metrics):
+    """Test several short factual questions answered in one Bedrock request."""
+    questions = [question for question, _ in FACTUAL_QUESTIONS]
+    actual_outputs = call_qwen_batch(questions)
     
-    # Additional assertion - check topic is mentioned
-    assert expected_topic.lower() in actual_output.lower(), \
-        f"Expected '{expected_topic}' in output"
+    for (question, expected_topic), actual_output in zip(FACTUAL_QUESTIONS, actual_outputs):
+        test_case = LLMTestCase(
+            input=question,
+            actual_output=actual_output,
+        )
+        assert_test(test_case, metrics=[eval_metrics["answer_relevancy"]])
+        
+        # Additional assertion - check topic is mentioned
+        assert TOPIC_PATTERNS[expected_topic].search(actual_output), \
+            f"Expected '{expected_topic}' in output"
 
 
 if __name__ == "__main__":
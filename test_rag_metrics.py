@@ -10,37 +10,69 @@ These metrics are essential for evaluating RAG pipelines.
 """
 import pytest
 from deepeval import assert_test
-from deepeval.metrics import (
-    ContextualPrecisionMetric,
-    ContextualRecallMetric,
-    ContextualRelevancyMetric,
-)
 from deepeval.test_case import LLMTestCase
 
-from bedrock_qwen import call_qwen_with_context
-from qwen_judge import QwenJudge
+import metrics_registry
+from bedrock_qwen import prefetch_answers
 
-# Initialize the judge model
-qwen_judge = QwenJudge()
 
 # ==============================================================================
 # RAG METRIC DEFINITIONS
 # ==============================================================================
 
-contextual_precision_metric = ContextualPrecisionMetric(
-    model=qwen_judge,
-    threshold=0.7,
-)
+@pytest.fixture(scope="session")
+def eval_metrics(qwen_judge):
+    """RAG metrics for this module, shared via metrics_registry."""
+    return {
+        "contextual_precision": metrics_registry.contextual_precision(threshold=0.7),
+        "contextual_recall": metrics_registry.contextual_recall(threshold=0.7),
+        "contextual_relevancy": metrics_registry.contextual_relevancy(threshold=0.7),
+        # All three contextual scores from a single judge call
+        "fused_rag": metrics_registry.fused_rag(threshold=0.7),
+    }
 
-contextual_recall_metric = ContextualRecallMetric(
-    model=qwen_judge,
-    threshold=0.7,
-)
 
-contextual_relevancy_metric = ContextualRelevancyMetric(
-    model=qwen_judge,
-    threshold=0.7,
-)
+# ==============================================================================
+# TEST INPUTS
+# ==============================================================================
+
+# Retrieval context per question
+RETRIEVAL_CONTEXTS = {
+    # Relevant context first, less relevant later
+    "When did Einstein develop the theory of relativity?": [
+        "Albert Einstein developed the theory of relativity in 1905.",
+        "Einstein was born in Germany in 1879.",
+        "The weather in Germany is temperate.",  # Less relevant
+    ],
+    "Tell me about the Great Wall of China.": [
+        "The Great Wall of China is over 13,000 miles long.",
+        "Construction began in the 7th century BC.",
+        "It was built to protect against invasions from the north.",
+    ],
+    "What is Python programming language?": [
+        "Python is a high-level programming language.",
+        "Python was created by Guido van Rossum in 1991.",
+        "Python emphasizes code readability and simplicity.",
+    ],
+    "Who founded Tesla and what products do they make?": [
+        "Tesla, Inc. was founded in 2003 by Martin Eberhard and Marc Tarpenning.",
+        "Elon Musk joined as chairman in 2004 and became CEO in 2008.",
+        "Tesla is known for electric vehicles like Model S, Model 3, Model X, and Model Y.",
+        "The company is headquartered in Austin, Texas.",
+    ],
+    "What programming languages does AWS Lambda support and what triggers it?": [
+        "AWS Lambda supports Python, Node.js, Java, Go, and .NET runtimes.",
+        "Lambda functions can be triggered by API Gateway, S3, DynamoDB, and other AWS services.",
+        "Maximum execution time for Lambda is 15 minutes.",
+        "Lambda pricing is based on number of requests and compute time.",
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def qwen_outputs():
+    """Generate every application-model output for this module concurrently."""
+    return prefetch_answers(RETRIEVAL_CONTEXTS)
 
 
 # ==============================================================================
@@ -53,17 +85,12 @@ class TestContextualPrecision:
     Measures whether the most relevant context nodes are ranked higher.
     """
     
-    def test_well_ordered_context(self):
+    def test_well_ordered_context(self, eval_metrics, qwen_outputs):
         """Test with context where relevant info comes first."""
-        # Relevant context first, less relevant later
-        retrieval_context = [
-            "Albert Einstein developed the theory of relativity in 1905.",
-            "Einstein was born in Germany in 1879.",
-            "The weather in Germany is temperate.",  # Less relevant
-        ]
         test_input = "When did Einstein develop the theory of relativity?"
+        retrieval_context = RETRIEVAL_CONTEXTS[test_input]
         expected_output = "Einstein developed the theory of relativity in 1905."
-        actual_output = call_qwen_with_context(test_input, retrieval_context)
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
@@ -71,7 +98,7 @@ class TestContextualPrecision:
             expected_output=expected_output,
             retrieval_context=retrieval_context,
         )
-        assert_test(test_case, metrics=[contextual_precision_metric])
+        assert_test(test_case, metrics=[eval_metrics["contextual_precision"]])
 
 
 # ==============================================================================
@@ -84,20 +111,16 @@ class TestContextualRecall:
     Measures whether the output captures all relevant information from context.
     """
     
-    def test_complete_answer_from_context(self):
+    def test_complete_answer_from_context(self, eval_metrics, qwen_outputs):
         """Test that answer captures key information from context."""
-        retrieval_context = [
-            "The Great Wall of China is over 13,000 miles long.",
-            "Construction began in the 7th century BC.",
-            "It was built to protect against invasions from the north.",
-        ]
         test_input = "Tell me about the Great Wall of China."
+        retrieval_context = RETRIEVAL_CONTEXTS[test_input]
         expected_output = (
             "The Great Wall of China is over 13,000 miles long, "
             "construction began in the 7th century BC, and it was "
             "built to protect against northern invasions."
         )
-        actual_output = call_qwen_with_context(test_input, retrieval_context)
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
@@ -105,7 +128,7 @@ class TestContextualRecall:
             expected_output=expected_output,
             retrieval_context=retrieval_context,
         )
-        assert_test(test_case, metrics=[contextual_recall_metric])
+        assert_test(test_case, metrics=[eval_metrics["contextual_recall"]])
 
 
 # ==============================================================================
@@ -118,22 +141,18 @@ class TestContextualRelevancy:
     Measures whether retrieved context is relevant to the input query.
     """
     
-    def test_relevant_context(self):
+    def test_relevant_context(self, eval_metrics, qwen_outputs):
         """Test with highly relevant context."""
-        retrieval_context = [
-            "Python is a high-level programming language.",
-            "Python was created by Guido van Rossum in 1991.",
-            "Python emphasizes code readability and simplicity.",
-        ]
         test_input = "What is Python programming language?"
-        actual_output = call_qwen_with_context(test_input, retrieval_context)
+        retrieval_context = RETRIEVAL_CONTEXTS[test_input]
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
             actual_output=actual_output,
             retrieval_context=retrieval_context,
         )
-        assert_test(test_case, metrics=[contextual_relevancy_metric])
+        assert_test(test_case, metrics=[eval_metrics["contextual_relevancy"]])
 
 
 # ==============================================================================
@@ -143,21 +162,16 @@ class TestContextualRelevancy:
 class TestRAGPipeline:
     """End-to-end RAG pipeline tests with multiple metrics."""
     
-    def test_complete_rag_evaluation(self):
+    def test_complete_rag_evaluation(self, eval_metrics, qwen_outputs):
         """Test a RAG response with all contextual metrics."""
-        retrieval_context = [
-            "Tesla, Inc. was founded in 2003 by Martin Eberhard and Marc Tarpenning.",
-            "Elon Musk joined as chairman in 2004 and became CEO in 2008.",
-            "Tesla is known for electric vehicles like Model S, Model 3, Model X, and Model Y.",
-            "The company is headquartered in Austin, Texas.",
-        ]
         test_input = "Who founded Tesla and what products do they make?"
+        retrieval_context = RETRIEVAL_CONTEXTS[test_input]
         expected_output = (
             "Tesla was founded by Martin Eberhard and Marc Tarpenning in 2003. "
             "Elon Musk joined later as chairman. Tesla makes electric vehicles "
             "including Model S, Model 3, Model X, and Model Y."
         )
-        actual_output = call_qwen_with_context(test_input, retrieval_context)
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
@@ -166,30 +180,18 @@ class TestRAGPipeline:
             retrieval_context=retrieval_context,
         )
         
-        # Run all RAG metrics
-        assert_test(
-            test_case,
-            metrics=[
-                contextual_precision_metric,
-                contextual_recall_metric,
-                contextual_relevancy_metric,
-            ]
-        )
+        # Run all RAG metrics in one fused judge call
+        assert_test(test_case, metrics=[eval_metrics["fused_rag"]])
     
-    def test_technical_documentation_rag(self):
+    def test_technical_documentation_rag(self, eval_metrics, qwen_outputs):
         """Test RAG with technical documentation context."""
-        retrieval_context = [
-            "AWS Lambda supports Python, Node.js, Java, Go, and .NET runtimes.",
-            "Lambda functions can be triggered by API Gateway, S3, DynamoDB, and other AWS services.",
-            "Maximum execution time for Lambda is 15 minutes.",
-            "Lambda pricing is based on number of requests and compute time.",
-        ]
         test_input = "What programming languages does AWS Lambda support and what triggers it?"
+        retrieval_context = RETRIEVAL_CONTEXTS[test_input]
         expected_output = (
             "AWS Lambda supports Python, Node.js, Java, Go, and .NET. "
             "It can be triggered by API Gateway, S3, DynamoDB, and other AWS services."
         )
-        actual_output = call_qwen_with_context(test_input, retrieval_context)
+        actual_output = qwen_outputs[test_input]
         
         test_case = LLMTestCase(
             input=test_input,
@@ -200,7 +202,7 @@ class TestRAGPipeline:
         
         assert_test(
             test_case,
-            metrics=[contextual_relevancy_metric, contextual_recall_metric]
+            metrics=[eval_metrics["contextual_relevancy"], eval_metrics["contextual_recall"]]
         )
 
 
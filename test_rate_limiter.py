@@ -0,0 +1,152 @@
+"""
+Rate Limiter Unit Tests
+
+Offline tests for the token-bucket and AIMD concurrency limiters; no Bedrock
+calls are made.
+"""
+import threading
+
+import pytest
+
+import rate_limiter
+from rate_limiter import AdaptiveConcurrencyLimiter, TokenBucketLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock; time.sleep advances it instead of blocking."""
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleep)
+    return sleeps
+
+
+# ==============================================================================
+# TOKEN BUCKET
+# ==============================================================================
+
+class TestTokenBucketLimiter:
+    """Tests for requests/tokens-per-minute pacing."""
+
+    def test_unlimited_never_waits(self, clock):
+        limiter = TokenBucketLimiter(None, None)
+        for _ in range(100):
+            limiter.acquire(10_000)
+        assert clock == []
+
+    def test_requests_per_minute(self, clock):
+        limiter = TokenBucketLimiter(60, None)
+        for _ in range(60):
+            limiter.acquire(1)
+        assert clock == []
+        # Bucket empty: the next request waits for one refill (1 second at 60 RPM)
+        limiter.acquire(1)
+        assert sum(clock) == pytest.approx(1.0)
+
+    def test_tokens_per_minute(self, clock):
+        limiter = TokenBucketLimiter(None, 1000)
+        limiter.acquire(1000)
+        limiter.acquire(500)
+        assert sum(clock) == pytest.approx(30.0)
+
+    def test_oversized_request_capped_at_budget(self, clock):
+        limiter = TokenBucketLimiter(None, 1000)
+        limiter.acquire(5000)
+        assert clock == []
+        limiter.acquire(5000)
+        assert sum(clock) == pytest.approx(60.0)
+
+
+def test_get_limiter_splits_budget_across_workers(monkeypatch):
+    monkeypatch.setenv("BEDROCK_RPM_LIMIT", "100")
+    monkeypatch.setenv("BEDROCK_TPM_LIMIT", "40000")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "4")
+    rate_limiter.get_limiter.cache_clear()
+    try:
+        limiter = rate_limiter.get_limiter()
+        assert limiter.requests_per_minute == 25
+        assert limiter.tokens_per_minute == 10_000
+    finally:
+        rate_limiter.get_limiter.cache_clear()
+
+
+# ==============================================================================
+# AIMD CONCURRENCY
+# ==============================================================================
+
+class TestAdaptiveConcurrencyLimiter:
+    """Tests for additive-increase/multiplicative-decrease concurrency."""
+
+    def test_initial_capped_at_maximum(self):
+        assert AdaptiveConcurrencyLimiter(32, 16).limit == 16
+
+    def test_grows_after_full_window(self):
+        limiter = AdaptiveConcurrencyLimiter(4, 16)
+        for _ in range(3):
+            limiter.on_success()
+        assert limiter.limit == 4
+        limiter.on_success()
+        assert limiter.limit == 5
+
+    def test_never_exceeds_maximum(self):
+        limiter = AdaptiveConcurrencyLimiter(2, 3)
+        for _ in range(100):
+            limiter.on_success()
+        assert limiter.limit == 3
+
+    def test_halves_on_throttle_down_to_one(self):
+        limiter = AdaptiveConcurrencyLimiter(8, 16)
+        limiter.on_throttle()
+        assert limiter.limit == 4
+        for _ in range(5):
+            limiter.on_throttle()
+        assert limiter.limit == 1
+
+    def test_throttle_resets_success_window(self):
+        limiter = AdaptiveConcurrencyLimiter(4, 16)
+        for _ in range(3):
+            limiter.on_success()
+        limiter.on_throttle()
+        limiter.on_success()
+        assert limiter.limit == 2
+
+    def test_blocks_at_limit_until_slot_released(self):
+        limiter = AdaptiveConcurrencyLimiter(1, 4)
+        entered = threading.Event()
+
+        def worker():
+            with limiter:
+                entered.set()
+
+        with limiter:
+            thread = threading.Thread(target=worker)
+            thread.start()
+            assert not entered.wait(0.1)
+        assert entered.wait(1)
+        thread.join()
+
+    def test_growth_wakes_waiter(self):
+        limiter = AdaptiveConcurrencyLimiter(1, 4)
+        entered = threading.Event()
+
+        def worker():
+            with limiter:
+                entered.set()
+
+        with limiter:
+            thread = threading.Thread(target=worker)
+            thread.start()
+            assert not entered.wait(0.1)
+            limiter.on_success()  # Window of 1 success widens the cap to 2
+            assert entered.wait(1)
+        thread.join()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+"""
+Response Cache Unit Tests
+
+Offline tests for the cache modes behind DEEPEVAL_CACHE_MODE and
+--deepeval-replay; the Bedrock invoke is replaced by a stub.
+"""
+import pytest
+
+import response_cache
+from response_cache import cache_mode, cached
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Fresh disk and memory cache and no DEEPEVAL_* overrides per test."""
+    monkeypatch.setattr(response_cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(response_cache, "_memory", {})
+    for name in ("DEEPEVAL_CACHE_MODE", "DEEPEVAL_NO_CACHE", "DEEPEVAL_REPLAY_MODELS"):
+        monkeypatch.delenv(name, raising=False)
+    return tmp_path
+
+
+@pytest.fixture
+def invoke():
+    """Cached stub invoke that counts calls and returns a new response each time."""
+    calls = []
+
+    @cached
+    def stub(model_id, prompt, max_tokens, temperature):
+        calls.append(prompt)
+        return f"{prompt} #{len(calls)}"
+
+    stub.calls = calls
+    return stub
+
+
+def forget_memory(monkeypatch):
+    """Simulate a new process: only the disk cache survives."""
+    monkeypatch.setattr(response_cache, "_memory", {})
+
+
+# ==============================================================================
+# CACHE MODE SELECTION
+# ==============================================================================
+
+class TestCacheMode:
+    """Tests for reading the mode from the environment."""
+
+    def test_default_enabled(self):
+        assert cache_mode("model") == "enabled"
+
+    def test_no_cache_alias(self, monkeypatch):
+        monkeypatch.setenv("DEEPEVAL_NO_CACHE", "1")
+        monkeypatch.setenv("DEEPEVAL_CACHE_MODE", "replay")
+        assert cache_mode("model") == "disabled"
+
+    def test_replay_models_override(self, monkeypatch):
+        monkeypatch.setenv("DEEPEVAL_REPLAY_MODELS", "app,other")
+        monkeypatch.setenv("DEEPEVAL_NO_CACHE", "1")
+        assert cache_mode("app") == "replay"
+        assert cache_mode("judge") == "disabled"
+
+    def test_invalid_mode_rejected(self, monkeypatch):
+        monkeypatch.setenv("DEEPEVAL_CACHE_MODE", "sometimes")
+        with pytest.raises(ValueError):
+            cache_mode("model")
+
+
+# ==============================================================================
+# CACHED INVOKE
+# ==============================================================================
+
+class TestCached:
+    """Tests for each mode's read/write behavior."""
+
+    def test_enabled_serves_hits_from_memory_and_disk(self, invoke, isolated_cache, monkeypatch):
+        assert invoke("model", "p", 16, 0.0) == "p #1"
+        assert invoke("model", "p", 16, 0.0) == "p #1"
+        forget_memory(monkeypatch)
+        assert invoke("model", "p", 16, 0.0) == "p #1"
+        assert invoke.calls == ["p"]
+        assert len(list(isolated_cache.glob("*.json"))) == 1
+
+    def test_key_covers_sampling_params(self, invoke):
+        invoke("model", "p", 16, 0.0)
+        invoke("model", "p", 32, 0.0)
+        invoke("model", "p", 16, 0.5)
+        invoke("other", "p", 16, 0.0)
+        assert len(invoke.calls) == 4
+
+    def test_replay_serves_recorded_and_raises_on_miss(self, invoke, monkeypatch):
+        invoke("model", "recorded", 16, 0.0)
+        forget_memory(monkeypatch)
+        monkeypatch.setenv("DEEPEVAL_CACHE_MODE", "replay")
+        assert invoke("model", "recorded", 16, 0.0) == "recorded #1"
+        with pytest.raises(RuntimeError, match="replay mode"):
+            invoke("model", "new", 16, 0.0)
+        assert invoke.calls == ["recorded"]
+
+    def test_write_only_skips_reads_but_overwrites(self, invoke, monkeypatch):
+        invoke("model", "p", 16, 0.0)
+        monkeypatch.setenv("DEEPEVAL_CACHE_MODE", "write-only")
+        assert invoke("model", "p", 16, 0.0) == "p #2"
+        monkeypatch.delenv("DEEPEVAL_CACHE_MODE")
+        forget_memory(monkeypatch)
+        assert invoke("model", "p", 16, 0.0) == "p #2"
+        assert len(invoke.calls) == 2
+
+    @pytest.mark.parametrize(
+        "env",
+        [
+            pytest.param({"DEEPEVAL_CACHE_MODE": "disabled"}, id="disabled"),
+            pytest.param({"DEEPEVAL_NO_CACHE": "1"}, id="no_cache"),
+        ],
+    )
+    def test_disabled_bypasses_cache(self, invoke, isolated_cache, monkeypatch, env):
+        invoke("model", "p", 16, 0.0)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        assert invoke("model", "p", 16, 0.0) == "p #2"
+        assert invoke("model", "fresh", 16, 0.0) == "fresh #3"
+        assert len(list(isolated_cache.glob("*.json"))) == 1
+
+    def test_replay_models_only_replays_listed_model(self, invoke, monkeypatch):
+        monkeypatch.setenv("DEEPEVAL_REPLAY_MODELS", "app")
+        with pytest.raises(RuntimeError):
+            invoke("app", "new", 16, 0.0)
+        assert invoke("judge", "new", 16, 0.0) == "new #1"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])